@@ -2,7 +2,7 @@
  * Configuration loading from environment variables and remi.toml.
  */
 
-import { existsSync, readFileSync, writeFileSync, copyFileSync } from "node:fs";
+import { existsSync, readFileSync, writeFileSync, copyFileSync, statSync } from "node:fs";
 import { homedir } from "node:os";
 import { join, resolve } from "node:path";
 import { parse as parseToml } from "smol-toml";
@@ -314,6 +314,44 @@ export function defaultRemiConfig(): RemiConfig {
   };
 }
 
+/** Parsed remi.toml per path, reused while the file's mtime and size are unchanged. */
+const _tomlCache = new Map<string, { mtimeMs: number; size: number; data: Record<string, unknown> }>();
+
+/**
+ * Parse a TOML file, skipping the parse on repeat loads. The table is shared between
+ * loads and deeply frozen; loadConfig copies the arrays and tables it hands out.
+ */
+function readTomlCached(path: string): Record<string, unknown> {
+  const st = statSync(path);
+  const cached = _tomlCache.get(path);
+  if (cached && cached.mtimeMs === st.mtimeMs && cached.size === st.size) {
+    return cached.data;
+  }
+  const data = deepFreeze(parseToml(readFileSync(path, "utf-8")) as Record<string, unknown>);
+  _tomlCache.set(path, { mtimeMs: st.mtimeMs, size: st.size, data });
+  return data;
+}
+
+function deepFreeze<T>(value: T): T {
+  if (value !== null && typeof value === "object" && !Object.isFrozen(value)) {
+    Object.freeze(value);
+    for (const v of Object.values(value)) deepFreeze(v);
+  }
+  return value;
+}
+
+/** Mutable copy of a cached TOML value: arrays and tables are copied, dates and scalars kept. */
+function thaw<T>(value: T): T {
+  if (Array.isArray(value)) return value.map(thaw) as T;
+  if (value !== null && typeof value === "object") {
+    const proto = Object.getPrototypeOf(value);
+    if (proto === Object.prototype || proto === null) {
+      return Object.fromEntries(Object.entries(value).map(([k, v]) => [k, thaw(v)])) as T;
+    }
+  }
+  return value;
+}
+
 /**
  * Load configuration from environment variables and optional remi.toml.
  * Priority: environment variables > remi.toml > defaults.
@@ -322,7 +360,7 @@ export function loadConfig(configPath?: string | null): RemiConfig {
   let fileData: Record<string, unknown> = {};
 
   if (configPath && existsSync(configPath)) {
-    fileData = parseToml(readFileSync(configPath, "utf-8")) as Record<string, unknown>;
+    fileData = readTomlCached(configPath);
   } else {
     const candidates = [
       join(process.cwd(), CONFIG_FILENAME),
@@ -330,7 +368,7 @@ export function loadConfig(configPath?: string | null): RemiConfig {
     ];
     for (const candidate of candidates) {
       if (existsSync(candidate)) {
-        fileData = parseToml(readFileSync(candidate, "utf-8")) as Record<string, unknown>;
+        fileData = readTomlCached(candidate);
         break;
       }
     }
@@ -358,7 +396,7 @@ export function loadConfig(configPath?: string | null): RemiConfig {
     provider: {
       name: env.REMI_PROVIDER ?? (providerData.name as string) ?? "claude_cli",
       fallback: env.REMI_FALLBACK ?? (providerData.fallback as string) ?? null,
-      allowedTools: (providerData.allowed_tools as string[]) ?? [],
+      allowedTools: thaw(providerData.allowed_tools as string[]) ?? [],
       model: env.REMI_MODEL ?? (providerData.model as string) ?? null,
       timeout: parseInt(env.REMI_TIMEOUT ?? String(providerData.timeout ?? 300), 10),
     },
@@ -371,18 +409,18 @@ export function loadConfig(configPath?: string | null): RemiConfig {
       domain: (env.FEISHU_DOMAIN ?? (feishuData.domain as string) ?? "feishu") as FeishuConfig["domain"],
       connectionMode: "websocket" as const,
       userAccessToken: env.FEISHU_USER_ACCESS_TOKEN ?? (feishuData.user_access_token as string) ?? "",
-      autoReplyGroups: (feishuData.auto_reply_groups as string[]) ?? [],
-      allowedGroups: (feishuData.allowed_groups as string[]) ?? [],
-      monitorGroups: (feishuData.monitor_groups as string[]) ??
-                     (feishuData.auto_reply_groups as string[]) ?? [],
-      triggerUserIds: (feishuData.trigger_user_ids as string[]) ?? [],
+      autoReplyGroups: thaw(feishuData.auto_reply_groups as string[]) ?? [],
+      allowedGroups: thaw(feishuData.allowed_groups as string[]) ?? [],
+      monitorGroups: thaw(feishuData.monitor_groups as string[]) ??
+                     thaw(feishuData.auto_reply_groups as string[]) ?? [],
+      triggerUserIds: thaw(feishuData.trigger_user_ids as string[]) ?? [],
     },
     bytedanceSso: bytedanceSsoData
       ? {
           clientId: env.BYTEDANCE_SSO_CLIENT_ID ?? (bytedanceSsoData.client_id as string) ?? "",
           ssoHost: env.BYTEDANCE_SSO_HOST ?? (bytedanceSsoData.sso_host as string) ?? "https://sso.bytedance.com",
           bytecloudHost: env.BYTEDANCE_BYTECLOUD_HOST ?? (bytedanceSsoData.bytecloud_host as string) ?? "https://cloud.bytedance.net",
-          scopes: (bytedanceSsoData.scopes as string[]) ?? ["read", "ciam.device.read"],
+          scopes: thaw(bytedanceSsoData.scopes as string[]) ?? ["read", "ciam.device.read"],
         }
       : undefined,
     tokenSync: tokenSyncData.map((r) => ({
@@ -391,7 +429,7 @@ export function loadConfig(configPath?: string | null): RemiConfig {
       target: (r.target as string) ?? "",
       format: (r.format as string) ?? "raw",
       key: (r.key as string) ?? undefined,
-      extraKeys: (r.extra_keys as Record<string, string>) ?? undefined,
+      extraKeys: thaw(r.extra_keys as Record<string, string>) ?? undefined,
     })),
     scheduler: {
       memoryCompactCron: (schedulerData.memory_compact_cron as string) ?? "0 3 * * *",
@@ -406,7 +444,7 @@ export function loadConfig(configPath?: string | null): RemiConfig {
       generateHour: parseInt(String(s.generate_hour ?? 6), 10),
       pushHour: parseInt(String(s.push_hour ?? 9), 10),
       pushMinute: parseInt(String(s.push_minute ?? 0), 10),
-      pushTargets: (s.push_targets as string[]) ?? [],
+      pushTargets: thaw(s.push_targets as string[]) ?? [],
       connectorName: (s.connector_name as string) ?? "feishu",
       outputDir: (s.output_dir as string) ?? join(homedir(), ".remi", "skill-reports", (s.name as string) ?? "unknown"),
       maxPushLength: parseInt(String(s.max_push_length ?? 4000), 10),
@@ -422,13 +460,13 @@ export function loadConfig(configPath?: string | null): RemiConfig {
       at: (j.at as string) ?? undefined,
       timeoutMs: j.timeout_ms != null ? parseInt(String(j.timeout_ms), 10) : undefined,
       deleteAfterRun: (j.delete_after_run as boolean) ?? undefined,
-      handlerConfig: (j.handler_config as Record<string, any>) ?? undefined,
+      handlerConfig: thaw(j.handler_config as Record<string, any>) ?? undefined,
     })),
     services: servicesData.map((s) => ({
       name: (s.name as string) ?? "unnamed",
       script: (s.script as string) ?? "",
       interpreter: (s.interpreter as string) ?? "bun",
-      args: (s.args as string[]) ?? [],
+      args: thaw(s.args as string[]) ?? [],
       cwd: (s.cwd as string) ?? homedir(),
       build: (s.build as string) ?? "",
       port: (s.port as number) ?? null,
@@ -438,14 +476,14 @@ export function loadConfig(configPath?: string | null): RemiConfig {
       http: (proxyData.http as string) ?? "",
       noProxy: (proxyData.no_proxy as string) ?? "",
     },
-    projects: projectsData,
+    projects: thaw(projectsData),
     bots: botsData.map((b) => ({
       id: (b.id as string) ?? "",
       name: (b.name as string) ?? "",
-      groups: (b.groups as string[]) ?? [],
+      groups: thaw(b.groups as string[]) ?? [],
       cwd: (b.cwd as string) ?? "",
-      allowedTools: (b.allowed_tools as string[]) ?? [],
-      addDirs: (b.add_dirs as string[]) ?? [],
+      allowedTools: thaw(b.allowed_tools as string[]) ?? [],
+      addDirs: thaw(b.add_dirs as string[]) ?? [],
       replyMode: ((b.reply_mode as string) ?? "direct") as BotProfile["replyMode"],
       systemPrompt: (b.system_prompt as string) ?? "",
     })),
@@ -498,6 +536,7 @@ export function migrateToCronJobs(config: RemiConfig): CronJobConfig[] {
 
 function _legacyToCronJobs(config: RemiConfig): CronJobConfig[] {
   const jobs: CronJobConfig[] = [];
+  // Always derived from the cron expression, so the two can't drift apart
   const compactHour = parseCronHourFromExpr(config.scheduler.memoryCompactCron);
 
   jobs.push(
@@ -674,7 +713,7 @@ function parseBotMenuItem(item: Record<string, unknown>): BotMenuItemConfig {
 
   return {
     name: (item.name as string) ?? "",
-    i18nName: (item.i18n_name as Record<string, string>) ?? undefined,
+    i18nName: thaw(item.i18n_name as Record<string, string>) ?? undefined,
     icon,
     tag: (item.tag as string) ?? undefined,
     behaviors,
@@ -696,11 +735,10 @@ function parseBotMenuConfig(data: Record<string, unknown>): BotMenuConfig {
   return { default: defaultItems, users };
 }
 
+/** Leading digits of the hour field (second field) of a cron expression. */
+const CRON_HOUR_RE = /^\S+\s+(\d+)/;
+
 function parseCronHourFromExpr(cronExpr: string): number {
-  const parts = cronExpr.split(" ");
-  if (parts.length >= 2) {
-    const hour = parseInt(parts[1], 10);
-    if (!isNaN(hour)) return hour;
-  }
-  return 3;
+  const m = CRON_HOUR_RE.exec(cronExpr);
+  return m ? parseInt(m[1], 10) : 3;
 }
@@ -33,6 +33,18 @@ import { writeEcosystem, runBuildsSync, getEcosystemPath } from "./pm2.js";
 
 const log = createLogger("core");
 
+/**
+ * Constant fallback when a stream ends without a result — built once and shared, so it is
+ * frozen along with its metadata and toolCalls containers.
+ */
+const NO_RESULT_RESPONSE: Readonly<AgentResponse> = Object.freeze(
+  createAgentResponse({
+    text: "[Error: no result from provider]",
+    metadata: Object.freeze({}),
+    toolCalls: Object.freeze([]) as AgentResponse["toolCalls"],
+  }),
+);
+
 /** Simple promise-based mutex for per-lane serialization. */
 class AsyncLock {
   private _queue: Array<() => void> = [];
@@ -567,10 +579,7 @@ export class Remi {
         lastResponse = event.response;
       }
     }
-    if (!lastResponse) {
-      return createAgentResponse({ text: "[Error: no result from provider]" });
-    }
-    return lastResponse;
+    return lastResponse ?? NO_RESULT_RESPONSE;
   }
 
   // ── Slash commands ───────────────────────────────────────
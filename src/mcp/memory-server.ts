@@ -123,6 +123,40 @@ const TOOLS = [
   },
 ];
 
+// ── Tool handlers ────────────────────────────────────────────
+
+type ToolArgs = Record<string, unknown>;
+
+/** Built once at module load; tools/call dispatches by name without per-call closures. */
+const TOOL_HANDLERS: Record<string, (args: ToolArgs) => Promise<string> | string> = {
+  async recall(args) {
+    const query = args.query as string;
+    mcpLog(`recall query="${query}"`);
+    const result = await store.recall(query, {
+      cwd: (args.cwd as string) || null,
+    });
+    mcpLog(`recall result: ${result ? result.length + " chars" : "empty"}`);
+    return result || "(无匹配结果)";
+  },
+
+  remember(args) {
+    const result = store.remember(
+      args.entity as string,
+      args.type as string,
+      args.observation as string,
+      (args.scope as "personal" | "project") || "personal",
+      (args.cwd as string) || null,
+    );
+    // Regenerate bridge so Claude Code's next session sees updated memory
+    try {
+      store.regenerateBridge();
+    } catch (e) {
+      process.stderr.write(`[${SERVER_NAME}] Bridge regeneration failed: ${e}\n`);
+    }
+    return result;
+  },
+};
+
 // ── JSON-RPC 2.0 helpers ─────────────────────────────────────
 
 interface JsonRpcRequest {
@@ -165,36 +199,12 @@ async function handleRequest(req: JsonRpcRequest): Promise<Record<string, unknow
     case "tools/call": {
       const params = req.params as { name: string; arguments?: Record<string, unknown> };
       const toolName = params?.name;
-      const args = params?.arguments ?? {};
+      const args: ToolArgs = params?.arguments ?? {};
 
-      if (toolName === "recall") {
-        const query = args.query as string;
-        mcpLog(`recall query="${query}"`);
-        const result = await store.recall(query, {
-          cwd: (args.cwd as string) || null,
-        });
-        mcpLog(`recall result: ${result ? result.length + " chars" : "empty"}`);
-        return jsonRpcResult(req.id, {
-          content: [{ type: "text", text: result || "(无匹配结果)" }],
-        });
-      }
-
-      if (toolName === "remember") {
-        const result = store.remember(
-          args.entity as string,
-          args.type as string,
-          args.observation as string,
-          (args.scope as "personal" | "project") || "personal",
-          (args.cwd as string) || null,
-        );
-        // Regenerate bridge so Claude Code's next session sees updated memory
-        try {
-          store.regenerateBridge();
-        } catch (e) {
-          process.stderr.write(`[${SERVER_NAME}] Bridge regeneration failed: ${e}\n`);
-        }
+      if (toolName && Object.hasOwn(TOOL_HANDLERS, toolName)) {
+        const handler = TOOL_HANDLERS[toolName];
         return jsonRpcResult(req.id, {
-          content: [{ type: "text", text: result }],
+          content: [{ type: "text", text: await handler(args) }],
         });
       }
 
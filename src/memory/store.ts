@@ -19,6 +19,12 @@ import {
   lstatSync,
   realpathSync,
   symlinkSync,
+  openSync,
+  fstatSync,
+  closeSync,
+  copyFileSync,
+  readSync,
+  chmodSync,
 } from "node:fs";
 import { join, relative, dirname, basename, resolve } from "node:path";
 import { homedir } from "node:os";
@@ -28,13 +34,198 @@ import { createLogger } from "../logger.js";
 
 const log = createLogger("memory");
 
-const PLURAL_MAP: Record<string, string> = {
-  person: "people",
-  child: "children",
-};
+/** Entity types whose directory under entities/ isn't just "<type>s". */
+const TYPE_DIRS: ReadonlyMap<string, string> = new Map([
+  ["person", "people"],
+  ["child", "children"],
+]);
 
 export const CONTEXT_WARN_THRESHOLD = 6000;
 
+/** Characters stripped from entity names to form file names. */
+const SLUG_UNSAFE_RE = /[<>:"/\\|?*\n\r\t]/g;
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+let _todayOrdinal = -1;
+let _todayStr = "";
+
+/** Today's UTC date (YYYY-MM-DD); only re-formatted when the day ordinal changes. */
+function todayStr(): string {
+  const ordinal = Math.floor(Date.now() / DAY_MS);
+  if (ordinal !== _todayOrdinal) {
+    _todayOrdinal = ordinal;
+    _todayStr = new Date(ordinal * DAY_MS).toISOString().slice(0, 10);
+  }
+  return _todayStr;
+}
+
+/** Set the frontmatter `updated:` field to the current time (second precision). */
+function stampUpdated(content: string): string {
+  const ts = new Date().toISOString().replace(/\.\d{3}Z$/, "");
+  return content.replace(/^updated:.*$/m, `updated: ${ts}`);
+}
+
+/**
+ * Read a file and the stat that matches it through one descriptor: open, fstat, read,
+ * close — one syscall fewer than stat(path) + readFile(path), and the pair can't race.
+ */
+function readWithStat(path: string): { text: string; mtimeMs: number; size: number } {
+  const fd = openSync(path, "r");
+  try {
+    const { mtimeMs, size } = fstatSync(fd);
+    return { text: readFileSync(fd, "utf-8"), mtimeMs, size };
+  } finally {
+    closeSync(fd);
+  }
+}
+
+/**
+ * True when lowercasing can't affect a search for `query`: it has no case of its own
+ * (CJK, digits, punctuation) and no U+0307, the one character lowercasing can introduce
+ * (İ -> i̇). For such queries the original and lowercased text give the same answer.
+ */
+function isCaseless(query: string): boolean {
+  return query === query.toLowerCase() && query === query.toUpperCase() && !query.includes("\u0307");
+}
+
+/** Distinguishes temp files of overlapping atomicWrite() calls within this process. */
+let _atomicWriteSeq = 0;
+
+/**
+ * Replace a file's contents via temp file + rename, so readers (the index, recall, the CLI
+ * reading MEMORY.md) never see a half-written file. No fsync — durability is unchanged.
+ * A symlinked path is written through to its target rather than replaced by a plain file,
+ * and an existing file keeps its permission bits.
+ */
+function atomicWrite(path: string, content: string): void {
+  let target = path;
+  try {
+    if (lstatSync(path).isSymbolicLink()) target = realpathSync(path);
+  } catch {
+    // New file — nothing to resolve
+  }
+  let mode: number | null = null;
+  try {
+    mode = statSync(target).mode & 0o7777;
+  } catch {
+    // New file — the umask default applies
+  }
+  const tmp = `${target}.${process.pid}.${++_atomicWriteSeq}.tmp`;
+  try {
+    writeFileSync(tmp, content, "utf-8");
+    if (mode !== null) chmodSync(tmp, mode);
+    renameSync(tmp, target);
+  } catch (e) {
+    try { unlinkSync(tmp); } catch { /* never created */ }
+    throw e;
+  }
+}
+
+// ── Frontmatter fast path ────────────────────────────────────
+
+/** Marker for anything the flat scanner won't decide on its own. */
+const UNSURE = Symbol("unsure");
+
+/** A whole frontmatter line, sticky: `key:` plus optional value, or a blank line. */
+const FM_LINE_RE = /(?:([A-Za-z_][\w-]*):(?:[ \t]+([^\n]*?))?|[ \t]*)[ \t]*\n/y;
+const FM_EDGE_BLANK_RE = /^[ \t]+|[ \t]+$/g;
+const FM_NUMBER_RE = /^-?(?:0|[1-9]\d*)(?:\.\d+)?$/;
+const FM_TIMESTAMP_RE = /^(\d{4})-(\d\d)-(\d\d)(?:T(\d\d):(\d\d):(\d\d))?$/;
+/** Plain scalars YAML could read as something other than a string (numbers, indicators, comments). */
+const FM_AMBIGUOUS_RE = /^[-?:,[\]{}#&*!|>'"%@`+.\d]|:\s|:$|\s#/;
+
+/** One YAML scalar from a flat frontmatter line, resolved the way js-yaml would, or UNSURE. */
+function scanScalar(value: string): unknown {
+  if (value === "" || value === "null" || value === "~") return null;
+  // Only spaces and tabs were trimmed; any other edge whitespace is YAML's call
+  if (value !== value.trim()) return UNSURE;
+  if (value === "true") return true;
+  if (value === "false") return false;
+  if (FM_NUMBER_RE.test(value)) return Number(value);
+  const ts = FM_TIMESTAMP_RE.exec(value);
+  if (ts) {
+    return new Date(Date.UTC(+ts[1], +ts[2] - 1, +ts[3], +(ts[4] ?? 0), +(ts[5] ?? 0), +(ts[6] ?? 0)));
+  }
+  const quote = value[0];
+  if ((quote === '"' || quote === "'") && value.length >= 2 && value.endsWith(quote)) {
+    const inner = value.slice(1, -1);
+    return inner.includes(quote) || (quote === '"' && inner.includes("\\")) ? UNSURE : inner;
+  }
+  if (FM_AMBIGUOUS_RE.test(value)) return UNSURE;
+  const lower = value.toLowerCase();
+  if (lower === "null" || lower === "true" || lower === "false") return UNSURE;
+  return value;
+}
+
+/**
+ * Parse the flat `key: value` frontmatter entity files use (scalars and one-line `[a, b]`
+ * lists) without a YAML parser. Returns null for anything else so the caller can fall back
+ * to gray-matter, which stays the reference for every construct the scanner declines.
+ */
+function scanFrontmatter(content: string): Record<string, unknown> | null {
+  if (!content.startsWith("---\n") || content.includes("\r")) return null;
+  const end = content.indexOf("\n---", 3);
+  if (end < 4) return null;
+  const after = content.charCodeAt(end + 4);
+  if (!Number.isNaN(after) && after !== 10) return null;
+
+  // One sticky regex walks the block line by line: `key: value` or blank, nothing else.
+  // Any line it can't consume stops the match short and sends the file to gray-matter.
+  const block = content.slice(4, end + 1);
+  const data: Record<string, unknown> = {};
+  FM_LINE_RE.lastIndex = 0;
+  while (FM_LINE_RE.lastIndex < block.length) {
+    const m = FM_LINE_RE.exec(block);
+    if (!m) return null;
+    const key = m[1];
+    if (key === undefined) continue;
+    if (key in data) return null;
+    const value = m[2] ?? "";
+
+    let parsed: unknown;
+    if (value[0] === "[" && value.endsWith("]")) {
+      const items = value.slice(1, -1).replace(FM_EDGE_BLANK_RE, "");
+      const list: unknown[] = [];
+      if (items !== "") {
+        for (const item of items.split(",")) {
+          const v = item.replace(FM_EDGE_BLANK_RE, "");
+          if (v === "" || /[[\]{}]/.test(v)) return null;
+          const scalar = scanScalar(v);
+          if (scalar === UNSURE || scalar === null) return null;
+          list.push(scalar);
+        }
+      }
+      parsed = list;
+    } else {
+      parsed = scanScalar(value);
+      if (parsed === UNSURE) return null;
+    }
+    data[key] = parsed;
+  }
+  return data;
+}
+
+function addPosting(postings: Map<string, Set<string>>, key: string, path: string): void {
+  const paths = postings.get(key);
+  if (paths) paths.add(path);
+  else postings.set(key, new Set([path]));
+}
+
+function removePosting(postings: Map<string, Set<string>>, key: string, path: string): void {
+  const paths = postings.get(key);
+  if (!paths) return;
+  paths.delete(path);
+  if (paths.size === 0) postings.delete(key);
+}
+
+/** A persisted index entry plus the stat it was built from. */
+interface IndexSnapshotEntry {
+  mtimeMs: number;
+  size: number;
+  entry: IndexEntry;
+}
+
 interface IndexEntry {
   type: string;
   name: string;
@@ -48,11 +239,32 @@ interface IndexEntry {
 
 export class MemoryStore {
   root: string;
+  /** `<root>/daily` and `<root>/daily/archive`, resolved once. */
+  readonly dailyDir: string;
+  readonly archiveDir: string;
   private _index = new Map<string, IndexEntry>();
+  /** Postings kept in step with _index so recall's type/tag filters are set lookups. */
+  private _byType = new Map<string, Set<string>>();
+  private _byTag = new Map<string, Set<string>>();
+  /**
+   * Parsed frontmatter per path, reused while the file's mtime and size are unchanged.
+   * LRU-bounded, and pruned to the index on every rebuild.
+   */
+  private _frontmatterCache = new Map<string, { mtimeMs: number; size: number; data: Record<string, unknown> }>();
+  /**
+   * Entity file contents for recall's substring search, reused while mtime and size are
+   * unchanged: the decoded text until a cased query first needs it lowercased, which then
+   * replaces it. LRU-bounded, and pruned to the index on every rebuild.
+   */
+  private _lowerTextCache = new Map<string, { mtimeMs: number; size: number; text: string; lowered: boolean }>();
+  /** cwd -> outermost directory holding .remi/, with the time it was resolved. */
+  private _projectRootCache = new Map<string, { root: string; at: number }>();
   private _vectorStore: VectorStore | null = null;
 
   constructor(root: string, vectorStore?: VectorStore | null) {
     this.root = root;
+    this.dailyDir = join(root, "daily");
+    this.archiveDir = join(this.dailyDir, "archive");
     this._vectorStore = vectorStore ?? null;
     this._ensureInitialized();
     this._buildIndex();
@@ -88,37 +300,121 @@ export class MemoryStore {
 
   _buildIndex(): void {
     this._index.clear();
+    this._byType.clear();
+    this._byTag.clear();
     const entitiesDir = join(this.root, "entities");
-    if (!existsSync(entitiesDir)) return;
-    this._scanDir(entitiesDir);
+    if (!existsSync(entitiesDir)) {
+      this._frontmatterCache.clear();
+      this._lowerTextCache.clear();
+      return;
+    }
+    const snapshot = this._loadIndexSnapshot();
+    const stats = new Map<string, { mtimeMs: number; size: number }>();
+    const reused = this._scanDir(entitiesDir, snapshot, stats);
+    // Forget cached parses and text of entities renamed or deleted outside the store
+    for (const cache of [this._frontmatterCache, this._lowerTextCache]) {
+      for (const path of cache.keys()) {
+        if (!this._index.has(path)) cache.delete(path);
+      }
+    }
+    // Rewrite the snapshot only when something was reparsed or has disappeared
+    if (reused !== this._index.size || reused !== snapshot.size) {
+      this._saveIndexSnapshot(stats);
+    }
   }
 
-  private _scanDir(dir: string): void {
+  /** Index every entity under `dir`; returns how many entries came from the snapshot. */
+  private _scanDir(
+    dir: string,
+    snapshot: Map<string, IndexSnapshotEntry>,
+    stats: Map<string, { mtimeMs: number; size: number }>,
+  ): number {
+    let reused = 0;
     for (const entry of readdirSync(dir, { withFileTypes: true })) {
       const fullPath = join(dir, entry.name);
       if (entry.isDirectory()) {
-        this._scanDir(fullPath);
+        reused += this._scanDir(fullPath, snapshot, stats);
       } else if (entry.name.endsWith(".md")) {
-        const meta = this._parseFrontmatter(fullPath);
-        this._index.set(fullPath, {
-          type: (meta.type as string) ?? "",
-          name: (meta.name as string) ?? basename(fullPath, ".md"),
-          tags: (meta.tags as string[]) ?? [],
-          summary: (meta.summary as string) ?? "",
-          aliases: (meta.aliases as string[]) ?? [],
-          importance: (meta.importance as number) ?? 0.5,
-          lastAccessed: meta.last_accessed instanceof Date
-            ? (meta.last_accessed as Date).toISOString().slice(0, 10)
-            : ((meta.last_accessed as string) ?? ""),
-          accessCount: (meta.access_count as number) ?? 0,
-        });
+        const snap = snapshot.get(fullPath);
+        if (snap) {
+          try {
+            const { mtimeMs, size } = statSync(fullPath);
+            if (snap.mtimeMs === mtimeMs && snap.size === size) {
+              this._setIndexEntry(fullPath, snap.entry);
+              stats.set(fullPath, { mtimeMs, size });
+              reused++;
+              continue;
+            }
+          } catch {
+            continue;
+          }
+        }
+        this._setIndexEntry(fullPath, this._readIndexEntry(fullPath));
+        // The parse just recorded the file's stat alongside its frontmatter
+        const parsed = this._frontmatterCache.get(fullPath);
+        if (parsed) stats.set(fullPath, { mtimeMs: parsed.mtimeMs, size: parsed.size });
       }
     }
+    return reused;
   }
 
   _invalidateIndex(path: string): void {
+    // Writes can land within the mtime granularity — never trust the caches for a known write
+    this._frontmatterCache.delete(path);
+    this._lowerTextCache.delete(path);
+    this._setIndexEntry(path, this._readIndexEntry(path));
+  }
+
+  private _setIndexEntry(path: string, entry: IndexEntry): void {
+    const prev = this._index.get(path);
+    if (prev) this._unpost(path, prev);
+    this._index.set(path, entry);
+    addPosting(this._byType, entry.type, path);
+    if (Array.isArray(entry.tags)) {
+      for (const tag of entry.tags) addPosting(this._byTag, tag, path);
+    }
+  }
+
+  private _deleteIndexEntry(path: string): void {
+    const prev = this._index.get(path);
+    if (!prev) return;
+    this._unpost(path, prev);
+    this._index.delete(path);
+  }
+
+  private _unpost(path: string, entry: IndexEntry): void {
+    removePosting(this._byType, entry.type, path);
+    if (Array.isArray(entry.tags)) {
+      for (const tag of entry.tags) removePosting(this._byTag, tag, path);
+    }
+  }
+
+  /**
+   * Entity paths that pass recall's type and tag filters: any of `tags`, and exactly
+   * `type`. Without filters this is the whole index.
+   */
+  private _filterCandidates(type: string | null, tags: string[] | null): Iterable<string> {
+    let pool: Set<string> | null = null;
+    if (tags && tags.length > 0) {
+      pool = new Set();
+      for (const tag of tags) {
+        for (const path of this._byTag.get(tag) ?? []) pool.add(path);
+      }
+    }
+    if (type) {
+      const typed = this._byType.get(type);
+      if (!typed) return [];
+      if (!pool) return typed;
+      for (const path of pool) {
+        if (!typed.has(path)) pool.delete(path);
+      }
+    }
+    return pool ?? this._index.keys();
+  }
+
+  private _readIndexEntry(path: string): IndexEntry {
     const meta = this._parseFrontmatter(path);
-    this._index.set(path, {
+    return {
       type: (meta.type as string) ?? "",
       name: (meta.name as string) ?? basename(path, ".md"),
       tags: (meta.tags as string[]) ?? [],
@@ -129,14 +425,76 @@ export class MemoryStore {
             ? (meta.last_accessed as Date).toISOString().slice(0, 10)
             : ((meta.last_accessed as string) ?? ""),
       accessCount: (meta.access_count as number) ?? 0,
-    });
+    };
+  }
+
+  // ── Index snapshot (.versions/.index.json) ────────────────
+
+  /** Entries whose file changed this close to the save may still change within the same mtime tick. */
+  private static SNAPSHOT_RACY_MS = 2000;
+
+  private get _indexSnapshotPath(): string {
+    return join(this.root, ".versions", ".index.json");
+  }
+
+  /**
+   * Load the index persisted by the previous process. Entries are only reused when the
+   * file's mtime and size still match, so a stale or foreign snapshot costs a reparse, never
+   * a wrong entry.
+   */
+  private _loadIndexSnapshot(): Map<string, IndexSnapshotEntry> {
+    const snapshot = new Map<string, IndexSnapshotEntry>();
+    try {
+      const data = JSON.parse(readFileSync(this._indexSnapshotPath, "utf-8")) as {
+        version?: number;
+        root?: string;
+        entries?: Array<[string, number, number, IndexEntry]>;
+      };
+      if (data.version !== 1 || data.root !== this.root || !Array.isArray(data.entries)) return snapshot;
+      for (const [path, mtimeMs, size, entry] of data.entries) {
+        snapshot.set(path, { mtimeMs, size, entry });
+      }
+    } catch {
+      // Missing or unreadable — full rebuild
+    }
+    return snapshot;
+  }
+
+  private _saveIndexSnapshot(stats: Map<string, { mtimeMs: number; size: number }>): void {
+    const racyAfter = Date.now() - MemoryStore.SNAPSHOT_RACY_MS;
+    const entries: Array<[string, number, number, IndexEntry]> = [];
+    for (const [path, entry] of this._index) {
+      const st = stats.get(path);
+      if (st && st.mtimeMs < racyAfter) entries.push([path, st.mtimeMs, st.size, entry]);
+    }
+    try {
+      atomicWrite(this._indexSnapshotPath, JSON.stringify({ version: 1, root: this.root, entries }));
+    } catch (e) {
+      log.warn("Failed to save index snapshot:", e);
+    }
   }
 
+  private static FRONTMATTER_CACHE_MAX = 2048;
+
   _parseFrontmatter(path: string): Record<string, unknown> {
     try {
-      const content = readFileSync(path, "utf-8");
-      const { data } = matter(content);
-      return data as Record<string, unknown>;
+      // Only stat on its own when there is a cached parse to validate
+      const cached = this._frontmatterCache.get(path);
+      if (cached) {
+        const { mtimeMs, size } = statSync(path);
+        this._frontmatterCache.delete(path);
+        if (cached.mtimeMs === mtimeMs && cached.size === size) {
+          this._frontmatterCache.set(path, cached);
+          return cached.data;
+        }
+      }
+      const { text, mtimeMs, size } = readWithStat(path);
+      const data = scanFrontmatter(text) ?? (matter(text).data as Record<string, unknown>);
+      if (this._frontmatterCache.size >= MemoryStore.FRONTMATTER_CACHE_MAX) {
+        this._frontmatterCache.delete(this._frontmatterCache.keys().next().value!);
+      }
+      this._frontmatterCache.set(path, { mtimeMs, size, data });
+      return data;
     } catch {
       return {};
     }
@@ -146,13 +504,11 @@ export class MemoryStore {
 
   private _typeToDir(typeName: string): string {
     const t = typeName.toLowerCase();
-    if (t in PLURAL_MAP) return PLURAL_MAP[t];
-    return t + "s";
+    return TYPE_DIRS.get(t) ?? t + "s";
   }
 
   _slugify(name: string): string {
-    let slug = name.replace(/[<>:"/\\|?*\n\r\t]/g, "");
-    slug = slug.trim().replace(/ /g, "-");
+    const slug = name.replace(SLUG_UNSAFE_RE, "").trim().replaceAll(" ", "-");
     return slug || "unnamed";
   }
 
@@ -215,25 +571,24 @@ export class MemoryStore {
     );
   }
 
+  /** Add an observation and bump `updated:` in one read and one write. */
   private _appendObservation(path: string, observation: string): void {
-    let content = readFileSync(path, "utf-8");
-    const ts = new Date().toISOString().slice(0, 10);
-    const entry = `\n- [${ts}] ${observation}`;
+    const content = readFileSync(path, "utf-8");
+    atomicWrite(path, stampUpdated(this._insertObservations(content, [observation])));
+  }
 
-    if (content.includes("## 备注")) {
-      content = content.replace("## 备注", `## 备注${entry}`);
-    } else {
-      content += `\n\n## 备注${entry}`;
+  /** Insert observations under "## 备注", newest first — same result as appending them one by one. */
+  private _insertObservations(content: string, observations: string[]): string {
+    const date = todayStr();
+    let entries = "";
+    for (const observation of observations) {
+      entries = `\n- [${date}] ${observation}` + entries;
     }
 
-    writeFileSync(path, content, "utf-8");
-  }
-
-  private _updateFrontmatterTimestamp(path: string): void {
-    const ts = new Date().toISOString().replace(/\.\d{3}Z$/, "");
-    let content = readFileSync(path, "utf-8");
-    content = content.replace(/^updated:.*$/m, `updated: ${ts}`);
-    writeFileSync(path, content, "utf-8");
+    if (content.includes("## 备注")) {
+      return content.replace("## 备注", () => `## 备注${entries}`);
+    }
+    return content + `\n\n## 备注${entries}`;
   }
 
   private _backup(path: string): void {
@@ -250,7 +605,9 @@ export class MemoryStore {
       .replace(/\.\d{3}Z$/, "")
       .slice(0, 15);
     const backupPath = join(versionsDir, `${stem}-${ts}.md`);
-    writeFileSync(backupPath, readFileSync(path, "utf-8"), "utf-8");
+    // Kernel-side copy (copy_file_range/clonefile where available) — no round trip through a JS string.
+    // Not a hardlink: appendMemory() appends to MEMORY.md in place, which would rewrite the backup too.
+    copyFileSync(path, backupPath);
 
     // Cleanup old versions for this entity
     const allVersions = readdirSync(versionsDir)
@@ -282,12 +639,8 @@ export class MemoryStore {
     }> = [];
 
     // 1. Search entities (index first, then body)
-    for (const [pathStr, meta] of this._index) {
-      if (type && meta.type !== type) continue;
-      if (tags && tags.length > 0) {
-        const metaTags = new Set(meta.tags);
-        if (!tags.some((t) => metaTags.has(t))) continue;
-      }
+    for (const pathStr of this._filterCandidates(type, tags)) {
+      const meta = this._index.get(pathStr)!;
       if (this._matches(pathStr, query, meta)) {
         results.push({ source: "entity", path: pathStr, meta });
       }
@@ -316,7 +669,7 @@ export class MemoryStore {
     }
 
     // 3a. Search daily logs
-    const dailyDir = join(this.root, "daily");
+    const dailyDir = this.dailyDir;
     if (existsSync(dailyDir)) {
       const files = readdirSync(dailyDir)
         .filter((f) => f.endsWith(".md"))
@@ -454,7 +807,7 @@ ${candidateTexts}`);
   private _updateAccessStats(path: string): void {
     try {
       let content = readFileSync(path, "utf-8");
-      const today = new Date().toISOString().slice(0, 10);
+      const today = todayStr();
 
       if (content.includes("last_accessed:")) {
         content = content.replace(/^last_accessed:.*$/m, `last_accessed: ${today}`);
@@ -465,7 +818,7 @@ ${candidateTexts}`);
           return `access_count: ${count + 1}`;
         });
       }
-      writeFileSync(path, content, "utf-8");
+      atomicWrite(path, content);
       this._invalidateIndex(path);
     } catch {
       // non-critical
@@ -485,7 +838,8 @@ ${candidateTexts}`);
       if (!cwd) {
         return "错误：scope=project 需要提供 cwd";
       }
-      const projectRoot = this._projectRoot(cwd);
+      // Writes resolve the root fresh: a stale cached answer would file the entity elsewhere
+      const projectRoot = this._findProjectRoot(cwd);
       if (!projectRoot) {
         return "错误：找不到项目根目录，请先 remi init";
       }
@@ -500,7 +854,6 @@ ${candidateTexts}`);
     if (existsSync(path)) {
       this._backup(path);
       this._appendObservation(path, observation);
-      this._updateFrontmatterTimestamp(path);
       this._invalidateIndex(path);
       result = `已更新 ${entity}：${observation}`;
     } else {
@@ -524,21 +877,31 @@ ${candidateTexts}`);
     return result;
   }
 
+  /** Upserts in flight at once; embedding is a network round trip per entity. */
+  private static REINDEX_CONCURRENCY = 8;
+
   async reindex(): Promise<number> {
-    if (!this._vectorStore) return 0;
+    const vectorStore = this._vectorStore;
+    if (!vectorStore) return 0;
     let count = 0;
-    for (const [path, meta] of this._index) {
-      try {
-        const content = readFileSync(path, "utf-8");
-        await this._vectorStore.upsert(path, content, {
-          type: meta.type,
-          name: meta.name,
-        });
-        count++;
-      } catch (e) {
-        log.warn(`Reindex failed for ${path}:`, e);
+    // Workers pull from one shared iterator so the embedding calls overlap
+    const pending = [...this._index][Symbol.iterator]();
+    const worker = async (): Promise<void> => {
+      for (const [path, meta] of pending) {
+        try {
+          const content = readFileSync(path, "utf-8");
+          await vectorStore.upsert(path, content, {
+            type: meta.type,
+            name: meta.name,
+          });
+          count++;
+        } catch (e) {
+          log.warn(`Reindex failed for ${path}:`, e);
+        }
       }
-    }
+    };
+    const workers = Math.min(MemoryStore.REINDEX_CONCURRENCY, this._index.size);
+    await Promise.all(Array.from({ length: workers }, worker));
     log.info(`Reindexed ${count} entities`);
     return count;
   }
@@ -558,11 +921,40 @@ ${candidateTexts}`);
     return this._matchesText(mdFile, query);
   }
 
+  private static LOWER_TEXT_CACHE_MAX = 512;
+
   private _matchesText(mdFile: string, query: string): boolean {
     try {
-      const content = readFileSync(mdFile, "utf-8");
-      return content.toLowerCase().includes(query.toLowerCase());
+      // Only entities are cached; daily logs and project memory are read per query
+      if (!this._index.has(mdFile)) {
+        const text = readFileSync(mdFile, "utf-8");
+        return isCaseless(query) ? text.includes(query) : text.toLowerCase().includes(query.toLowerCase());
+      }
+      // A stat per file instead of a read + lowercase per file per query
+      let cached = this._lowerTextCache.get(mdFile);
+      if (cached) {
+        const { mtimeMs, size } = statSync(mdFile);
+        if (cached.mtimeMs !== mtimeMs || cached.size !== size) cached = undefined;
+      }
+      this._lowerTextCache.delete(mdFile);
+      if (!cached) {
+        const { text, mtimeMs, size } = readWithStat(mdFile);
+        cached = { mtimeMs, size, text, lowered: false };
+        if (this._lowerTextCache.size >= MemoryStore.LOWER_TEXT_CACHE_MAX) {
+          this._lowerTextCache.delete(this._lowerTextCache.keys().next().value!);
+        }
+      }
+      this._lowerTextCache.set(mdFile, cached);
+      // Caseless queries (typically CJK) match the same way on the original and the
+      // lowercased text, so the file is only lowercased once a cased query needs it
+      if (isCaseless(query)) return cached.text.includes(query);
+      if (!cached.lowered) {
+        cached.text = cached.text.toLowerCase();
+        cached.lowered = true;
+      }
+      return cached.text.includes(query.toLowerCase());
     } catch {
+      this._lowerTextCache.delete(mdFile);
       return false;
     }
   }
@@ -736,7 +1128,28 @@ ${candidateTexts}`);
     return parts.length > 0 ? parts.join("\n\n---\n\n") : "";
   }
 
+  /** How long a resolved project root is trusted before the upward walk is repeated. */
+  private static PROJECT_ROOT_TTL_MS = 30_000;
+  private static PROJECT_ROOT_CACHE_MAX = 256;
+
   _projectRoot(cwd: string): string | null {
+    // gatherContext/recall/_buildManifest resolve the same cwd back to back. Misses
+    // aren't cached, so a freshly created .remi/ is seen on the next call.
+    const now = Date.now();
+    const cached = this._projectRootCache.get(cwd);
+    if (cached && now - cached.at < MemoryStore.PROJECT_ROOT_TTL_MS) return cached.root;
+
+    const root = this._findProjectRoot(cwd);
+    this._projectRootCache.delete(cwd);
+    if (root === null) return null;
+    if (this._projectRootCache.size >= MemoryStore.PROJECT_ROOT_CACHE_MAX) {
+      this._projectRootCache.delete(this._projectRootCache.keys().next().value!);
+    }
+    this._projectRootCache.set(cwd, { root, at: now });
+    return root;
+  }
+
+  private _findProjectRoot(cwd: string): string | null {
     let p = resolve(cwd);
     let root: string | null = null;
     while (true) {
@@ -802,7 +1215,7 @@ ${candidateTexts}`);
     }
 
     // 4. Daily log entry
-    const dailyDir = join(this.root, "daily");
+    const dailyDir = this.dailyDir;
     if (existsSync(dailyDir)) {
       const days = readdirSync(dailyDir)
         .filter((f) => f.endsWith(".md"))
@@ -818,29 +1231,56 @@ ${candidateTexts}`);
     }
 
     if (rows.length === 0) return "";
-    let header = "# 可用记忆（使用 recall 工具查看详情）\n\n";
-    header += "| 来源 | 路径/名称 | 摘要 |\n|------|----------|------|\n";
+    const lines = [
+      "# 可用记忆（使用 recall 工具查看详情）",
+      "",
+      "| 来源 | 路径/名称 | 摘要 |",
+      "|------|----------|------|",
+    ];
     for (const r of rows) {
-      header += `| ${r.source} | ${r.name} | ${r.summary} |\n`;
+      lines.push(`| ${r.source} | ${r.name} | ${r.summary} |`);
     }
-    return header;
+    // One join instead of growing the table string row by row
+    return lines.join("\n") + "\n";
   }
 
+  /** Bytes read up front by _readFirstLine — plenty for a title line. */
+  private static FIRST_LINE_PROBE_BYTES = 4096;
+
   private _readFirstLine(mdFile: string): string {
     try {
-      const content = readFileSync(mdFile, "utf-8");
-      for (const line of content.split("\n")) {
-        const trimmed = line.trim();
-        if (trimmed) {
-          return trimmed.replace(/^#+\s*/, "").trim();
-        }
+      // Only the head of the file is needed; the full read is a fallback for a
+      // file whose first non-blank line doesn't end inside the probe
+      const probe = Buffer.allocUnsafe(MemoryStore.FIRST_LINE_PROBE_BYTES);
+      const fd = openSync(mdFile, "r");
+      let n: number;
+      try {
+        n = readSync(fd, probe, 0, probe.length, 0);
+      } finally {
+        closeSync(fd);
       }
-      return "";
+      let head = probe.toString("utf-8", 0, n);
+      const whole = n < probe.length;
+      if (!whole) head = head.slice(0, head.lastIndexOf("\n") + 1);
+
+      const line = MemoryStore._firstNonBlankLine(head);
+      if (line || whole) return line;
+      return MemoryStore._firstNonBlankLine(readFileSync(mdFile, "utf-8"));
     } catch {
       return "";
     }
   }
 
+  private static _firstNonBlankLine(content: string): string {
+    for (const line of content.split("\n")) {
+      const trimmed = line.trim();
+      if (trimmed) {
+        return trimmed.replace(/^#+\s*/, "").trim();
+      }
+    }
+    return "";
+  }
+
   private _findRemiMemoryFiles(root: string, callback: (path: string) => void): void {
     const remiMemory = join(root, ".remi", "memory.md");
     if (existsSync(remiMemory)) {
@@ -888,8 +1328,7 @@ ${candidateTexts}`);
       return;
     }
     this._backup(path);
-    writeFileSync(path, content, "utf-8");
-    this._updateFrontmatterTimestamp(path);
+    atomicWrite(path, stampUpdated(content));
     this._invalidateIndex(path);
   }
 
@@ -901,10 +1340,47 @@ ${candidateTexts}`);
     }
     this._backup(path);
     this._appendObservation(path, observation);
-    this._updateFrontmatterTimestamp(path);
     this._invalidateIndex(path);
   }
 
+  /**
+   * Apply many [name, type, observation] ops with one read and one write per entity.
+   * Unknown entities are created with the type of their first op.
+   */
+  applyEntityBatch(ops: Array<[string, string, string]>): number {
+    const grouped = new Map<string, { type: string; observations: string[] }>();
+    for (const [name, type, observation] of ops) {
+      const group = grouped.get(name);
+      if (group) group.observations.push(observation);
+      else grouped.set(name, { type, observations: [observation] });
+    }
+
+    let applied = 0;
+    for (const [name, { type, observations }] of grouped) {
+      try {
+        const path =
+          this._findEntityByName(name) ??
+          this._resolveEntityPath(name, type, join(this.root, "entities"));
+        let content: string;
+        if (existsSync(path)) {
+          this._backup(path);
+          content = this._insertObservations(readFileSync(path, "utf-8"), observations);
+        } else {
+          content = this._renderNewEntity(name, type, observations[0], "agent-inferred");
+          if (observations.length > 1) {
+            content = this._insertObservations(content, observations.slice(1));
+          }
+        }
+        atomicWrite(path, stampUpdated(content));
+        this._invalidateIndex(path);
+        applied += observations.length;
+      } catch (e) {
+        log.warn(`Failed to apply entity batch for ${name}:`, e);
+      }
+    }
+    return applied;
+  }
+
   patchProjectMemory(
     projectPath: string,
     section: string,
@@ -939,7 +1415,7 @@ ${candidateTexts}`);
       text = text.trimEnd() + `\n\n${sectionHeader}\n${content}\n`;
     }
 
-    writeFileSync(memoryFile, text, "utf-8");
+    atomicWrite(memoryFile, text);
   }
 
   deleteEntity(name: string): void {
@@ -950,7 +1426,9 @@ ${candidateTexts}`);
     }
     this._backup(path);
     unlinkSync(path);
-    this._index.delete(path);
+    this._deleteIndexEntry(path);
+    this._frontmatterCache.delete(path);
+    this._lowerTextCache.delete(path);
   }
 
   _findEntityByName(name: string): string | null {
@@ -975,7 +1453,7 @@ ${candidateTexts}`);
 
   writeMemory(content: string): void {
     this._backup(this.memoryFile);
-    writeFileSync(this.memoryFile, content, "utf-8");
+    atomicWrite(this.memoryFile, content);
   }
 
   appendMemory(entry: string): void {
@@ -984,8 +1462,8 @@ ${candidateTexts}`);
   }
 
   private _dailyPath(date?: string | null): string {
-    const d = date ?? new Date().toISOString().slice(0, 10);
-    return join(this.root, "daily", `${d}.md`);
+    const d = date ?? todayStr();
+    return join(this.dailyDir, `${d}.md`);
   }
 
   readDaily(date?: string | null): string {
@@ -1006,17 +1484,19 @@ ${candidateTexts}`);
       mkdirSync(dir, { recursive: true });
     }
 
+    const line = `- [${timestamp}] ${entry.trimEnd()}\n`;
     if (!existsSync(path) || statSync(path).size === 0) {
-      const d = date ?? now.toISOString().slice(0, 10);
-      writeFileSync(path, `# ${d}\n\n`, "utf-8");
+      // New day file: header and first entry in one write
+      writeFileSync(path, `# ${date ?? todayStr()}\n\n${line}`, "utf-8");
+    } else {
+      appendFileSync(path, line, "utf-8");
     }
-    appendFileSync(path, `- [${timestamp}] ${entry.trimEnd()}\n`, "utf-8");
   }
 
   cleanupOldDailies(keepDays: number = 30): number {
     const cutoff = Date.now() - keepDays * 24 * 60 * 60 * 1000;
     let removed = 0;
-    const dailyDir = join(this.root, "daily");
+    const dailyDir = this.dailyDir;
     if (!existsSync(dailyDir)) return 0;
 
     for (const file of readdirSync(dailyDir)) {
@@ -1035,7 +1515,14 @@ ${candidateTexts}`);
     const versionsDir = join(this.root, ".versions");
     if (!existsSync(versionsDir)) return 0;
 
-    const files = readdirSync(versionsDir)
+    // Only backup files count; nothing to stat or sort while under the limit
+    const names: string[] = [];
+    for (const entry of readdirSync(versionsDir, { withFileTypes: true })) {
+      if (entry.isFile() && entry.name.endsWith(".md")) names.push(entry.name);
+    }
+    if (names.length <= keep) return 0;
+
+    const files = names
       .map((f) => ({
         name: f,
         mtime: statSync(join(versionsDir, f)).mtimeMs,
@@ -84,7 +84,8 @@ export interface Provider {
     options?: SendOptions,
   ): AsyncGenerator<StreamEvent>;
 
-  healthCheck(): Promise<boolean>;
+  /** Resolve false once `signal` aborts, stopping any work the check started. */
+  healthCheck(signal?: AbortSignal): Promise<boolean>;
 }
 
 /** Create a default AgentResponse with sensible defaults. */
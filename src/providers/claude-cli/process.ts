@@ -18,8 +18,11 @@ import {
   type ThinkingDelta,
   type ToolResultMessage,
   type ToolUseRequest,
+  decodeInputJson,
+  escapeInputJson,
   formatToolResult,
   formatUserMessage,
+  matchInputJsonDelta,
   parseLine,
 } from "./protocol.js";
 import { createLogger } from "../../logger.js";
@@ -29,16 +32,23 @@ const log = createLogger("claude-proc");
 /** Tool handler: async (ToolUseRequest) -> string (custom tool) or null (built-in, not handled). */
 export type ToolHandler = (request: ToolUseRequest) => Promise<string | null>;
 
+/** Built-in tool the CLI is executing itself; timed until content resumes. */
+type BuiltInToolPending = { toolUseId: string; name: string; t0: number };
+
 /** Simple promise-based mutex for serializing sends. */
 class AsyncLock {
   private _queue: Array<() => void> = [];
   private _locked = false;
 
+  /** Take the lock synchronously if it is free; no promise or microtask hop. */
+  tryAcquire(): boolean {
+    if (this._locked) return false;
+    this._locked = true;
+    return true;
+  }
+
   async acquire(): Promise<void> {
-    if (!this._locked) {
-      this._locked = true;
-      return;
-    }
+    if (this.tryAcquire()) return;
     return new Promise<void>((resolve) => {
       this._queue.push(resolve);
     });
@@ -66,8 +76,14 @@ export class ClaudeProcessManager {
   private _sessionId: string | null = null;
   private _lock = new AsyncLock();
   private _started = false;
-  private _reader: ReadableStreamDefaultReader<string> | null = null;
+  private _reader: ReadableStreamDefaultReader<Uint8Array> | null = null;
+  /** Incremental UTF-8 decoder for stdout — holds split multi-byte sequences between reads. */
+  private _decoder = new TextDecoder();
+  /** Trailing partial line from the last chunk read. */
   private _lineBuffer = "";
+  /** Complete lines framed from the last chunk, consumed from _pendingHead onward. */
+  private _pendingLines: string[] = [];
+  private _pendingHead = 0;
   /** Dynamic timeout for _readline(), adjusted based on rate limits and tool execution. */
   private _dynamicTimeoutMs = ClaudeProcessManager.READLINE_TIMEOUT_MS;
   /** Count of reader rebuilds in the current sendAndStream() call. */
@@ -147,10 +163,7 @@ export class ClaudeProcessManager {
     });
 
     // Set up line reader from stdout
-    const decoder = new TextDecoderStream();
-    this._process.stdout.pipeTo(decoder.writable).catch(() => {});
-    this._reader = decoder.readable.getReader();
-    this._lineBuffer = "";
+    this._attachReader(this._process.stdout);
 
     // Note: Claude CLI stream-json mode emits the system init message only after
     // the first user message is sent. We don't block here — the system message
@@ -164,7 +177,9 @@ export class ClaudeProcessManager {
     toolHandler?: ToolHandler | null,
     media?: MediaAttachment[],
   ): AsyncGenerator<ParsedMessage> {
-    await this._lock.acquire();
+    // One turn per process at a time. The provider pool already gives each chat its
+    // own manager, so the lock is almost always free — take it without awaiting then.
+    if (!this._lock.tryAcquire()) await this._lock.acquire();
     try {
       if (!this.isAlive) {
         throw new Error("Process not running — call start() first");
@@ -177,13 +192,16 @@ export class ClaudeProcessManager {
       let pendingTool: ToolUseRequest | null = null;
       let inputChunks: string[] = [];
       // Track built-in tool timing (tools not handled by Remi)
-      let builtInToolPending: { toolUseId: string; name: string; t0: number } | null = null;
+      let builtInToolPending: BuiltInToolPending | null = null;
       // Reset dynamic state for this interaction
       this._dynamicTimeoutMs = ClaudeProcessManager.READLINE_TIMEOUT_MS;
       this._readerRebuildCount = 0;
 
       while (true) {
-        const line = await this._readline(this._dynamicTimeoutMs);
+        // Lines already framed from the last chunk are taken without an await
+        const line =
+          (this.isAlive ? this._takeBufferedLine() : null) ??
+          await this._readline(this._dynamicTimeoutMs);
         if (line === null) {
           // Distinguish timeout/hang from graceful EOF
           if (this._process && !this._process.killed) {
@@ -197,6 +215,15 @@ export class ClaudeProcessManager {
           break;
         }
 
+        // Tool-input deltas are only accumulated: keep the escaped fragment, skip the frame parse
+        if (pendingTool) {
+          const partial = matchInputJsonDelta(line);
+          if (partial !== null) {
+            inputChunks.push(partial);
+            continue;
+          }
+        }
+
         const msg = parseLine(line);
 
         // Skip unparseable lines (bad JSON, etc.)
@@ -256,172 +283,99 @@ export class ClaudeProcessManager {
           this._dynamicTimeoutMs = ClaudeProcessManager.READLINE_TIMEOUT_MS;
         }
 
-        // Tool use start (streaming — input comes via deltas)
-        if (msg.kind === "tool_use" && Object.keys(msg.input).length === 0) {
-          pendingTool = msg;
-          inputChunks = [];
-          continue;
-        }
-
-        // Tool use with complete input (non-streaming assistant message)
-        if (msg.kind === "tool_use" && Object.keys(msg.input).length > 0) {
-          yield msg;
-          if (toolHandler) {
-            const t0 = Date.now();
-            const resultText = await toolHandler(msg);
-            if (resultText !== null) {
-              // Custom tool handled by Remi
-              const elapsed = Date.now() - t0;
-              await this._writeLine(formatToolResult(msg.toolUseId, resultText));
-              yield {
-                kind: "tool_result",
-                toolUseId: msg.toolUseId,
-                name: msg.name,
-                result: resultText.slice(0, 1500),
-                durationMs: elapsed,
-              } as ToolResultMessage;
+        // One branch per frame: typed messages by kind, raw dicts by their CLI type
+        switch (msg.kind) {
+          // Tool use: streamed start (input arrives via deltas) or complete input
+          case "tool_use": {
+            const tool = msg as ToolUseRequest;
+            if (Object.keys(tool.input).length === 0) {
+              pendingTool = tool;
+              inputChunks = [];
             } else {
-              // Built-in tool — CLI handles it; track timing
-              builtInToolPending = { toolUseId: msg.toolUseId, name: msg.name, t0 };
+              builtInToolPending = (yield* this._runTool(tool, toolHandler)) ?? builtInToolPending;
             }
+            continue;
           }
-          continue;
-        }
 
-        // Input JSON delta accumulation
-        if (
-          !("kind" in msg) &&
-          (msg as Record<string, unknown>).type === "content_block_delta"
-        ) {
-          const delta = ((msg as Record<string, unknown>).delta as Record<string, unknown>) ?? {};
-          if (delta.type === "input_json_delta" && pendingTool) {
-            inputChunks.push((delta.partial_json as string) ?? "");
+          // System init (emitted before first response)
+          case "system": {
+            const sysMsg = msg as SystemMessage;
+            this._sessionId = sysMsg.sessionId;
+            const mcpInfo = sysMsg.mcpServers
+              .map((s) => `${s.name}:${s.status}`)
+              .join(", ");
+            log.info(`session=${sysMsg.sessionId.slice(0, 12)}... model=${sysMsg.model} mcp=[${mcpInfo}]`);
+            yield msg;  // Pass to provider so it can capture model
             continue;
           }
-        }
 
-        // Content block stop — finalize pending tool if any
-        if (
-          !("kind" in msg) &&
-          (msg as Record<string, unknown>).type === "content_block_stop"
-        ) {
-          if (pendingTool) {
-            const fullJson = inputChunks.join("");
-            if (fullJson) {
-              try {
-                pendingTool.input = JSON.parse(fullJson);
-              } catch {
-                log.warn("Failed to parse tool input:", fullJson.slice(0, 200));
-              }
-            }
+          // Thinking / text deltas
+          case "thinking_delta":
+          case "content_delta":
+            yield msg;
+            continue;
 
-            yield pendingTool;
-            if (toolHandler) {
-              const t0 = Date.now();
-              const resultText = await toolHandler(pendingTool);
-              if (resultText !== null) {
-                // Custom tool handled by Remi
-                const elapsed = Date.now() - t0;
-                await this._writeLine(formatToolResult(pendingTool.toolUseId, resultText));
-                yield {
-                  kind: "tool_result",
-                  toolUseId: pendingTool.toolUseId,
-                  name: pendingTool.name,
-                  result: resultText.slice(0, 1500),
-                  durationMs: elapsed,
-                } as ToolResultMessage;
-              } else {
-                // Built-in tool — CLI handles it; track timing
-                builtInToolPending = { toolUseId: pendingTool.toolUseId, name: pendingTool.name, t0 };
+          // Result — end of turn
+          case "result":
+            this._sessionId = (msg as ResultMessage).sessionId || this._sessionId;
+            yield msg;
+            return;
+
+          // Assistant blocks (non-streaming path with multiple content blocks)
+          case "assistant_blocks":
+            for (const block of (msg as AssistantBlocks).blocks) {
+              if (block.kind === "thinking_delta" || block.kind === "content_delta") {
+                yield block;
+              } else if (block.kind === "tool_use") {
+                builtInToolPending =
+                  (yield* this._runTool(block as ToolUseRequest, toolHandler)) ?? builtInToolPending;
               }
             }
+            continue;
 
-            pendingTool = null;
-            inputChunks = [];
+          // Rate limit — yield so downstream can show warning + extend timeout
+          case "rate_limit": {
+            const retryMs = (msg as import("./protocol.js").RateLimitEvent).retryAfterMs ?? 0;
+            log.warn(`Rate limited: retry after ${retryMs}ms`);
+            // Extend readline timeout to accommodate CLI's internal retry wait
+            this._dynamicTimeoutMs = Math.max(retryMs + 120_000, this._dynamicTimeoutMs);
+            log.info(`Dynamic timeout extended to ${Math.round(this._dynamicTimeoutMs / 1000)}s (rate limit)`);
+            yield msg;
+            continue;
           }
-          continue;
-        }
 
-        // System init (emitted before first response)
-        if (msg.kind === "system") {
-          const sysMsg = msg as SystemMessage;
-          this._sessionId = sysMsg.sessionId;
-          const mcpInfo = sysMsg.mcpServers
-            .map((s) => `${s.name}:${s.status}`)
-            .join(", ");
-          log.info(`session=${sysMsg.sessionId.slice(0, 12)}... model=${sysMsg.model} mcp=[${mcpInfo}]`);
-          yield msg;  // Pass to provider so it can capture model
-          continue;
+          // Error event
+          case "error":
+            log.error(`CLI error event: ${msg.error} (${msg.code})`);
+            yield msg;
+            continue;
         }
 
-        // Thinking delta
-        if (msg.kind === "thinking_delta") {
-          yield msg;
-          continue;
-        }
+        // Raw frames
+        const raw = msg as Record<string, unknown>;
 
-        // Text delta
-        if (msg.kind === "content_delta") {
-          yield msg;
+        // Input JSON delta accumulation
+        if (raw.type === "content_block_delta") {
+          const delta = (raw.delta as Record<string, unknown>) ?? {};
+          if (delta.type === "input_json_delta" && pendingTool) {
+            inputChunks.push(escapeInputJson((delta.partial_json as string) ?? ""));
+          }
           continue;
         }
 
-        // Result — end of turn
-        if (msg.kind === "result") {
-          this._sessionId = msg.sessionId || this._sessionId;
-          yield msg;
-          return;
-        }
-
-        // Assistant blocks (non-streaming path with multiple content blocks)
-        if (msg.kind === "assistant_blocks") {
-          for (const block of (msg as AssistantBlocks).blocks) {
-            if (block.kind === "thinking_delta" || block.kind === "content_delta") {
-              yield block;
-            } else if (block.kind === "tool_use") {
-              yield block;
-              if (toolHandler) {
-                const t0 = Date.now();
-                const resultText = await toolHandler(block as ToolUseRequest);
-                if (resultText !== null) {
-                  const elapsed = Date.now() - t0;
-                  await this._writeLine(formatToolResult((block as ToolUseRequest).toolUseId, resultText));
-                  yield {
-                    kind: "tool_result",
-                    toolUseId: (block as ToolUseRequest).toolUseId,
-                    name: (block as ToolUseRequest).name,
-                    result: resultText.slice(0, 1500),
-                    durationMs: elapsed,
-                  } as ToolResultMessage;
-                } else {
-                  builtInToolPending = {
-                    toolUseId: (block as ToolUseRequest).toolUseId,
-                    name: (block as ToolUseRequest).name,
-                    t0: Date.now(),
-                  };
-                }
-              }
+        // Content block stop — finalize pending tool if any
+        if (raw.type === "content_block_stop" && pendingTool) {
+          const escaped = inputChunks.join("");
+          if (escaped) {
+            try {
+              pendingTool.input = JSON.parse(decodeInputJson(escaped));
+            } catch {
+              log.warn("Failed to parse tool input:", escaped.slice(0, 200));
             }
           }
-          continue;
-        }
-
-        // Rate limit — yield so downstream can show warning + extend timeout
-        if (msg.kind === "rate_limit") {
-          const retryMs = (msg as import("./protocol.js").RateLimitEvent).retryAfterMs ?? 0;
-          log.warn(`Rate limited: retry after ${retryMs}ms`);
-          // Extend readline timeout to accommodate CLI's internal retry wait
-          this._dynamicTimeoutMs = Math.max(retryMs + 120_000, this._dynamicTimeoutMs);
-          log.info(`Dynamic timeout extended to ${Math.round(this._dynamicTimeoutMs / 1000)}s (rate limit)`);
-          yield msg;
-          continue;
-        }
-
-        // Error event
-        if (msg.kind === "error") {
-          log.error(`CLI error event: ${msg.error} (${msg.code})`);
-          yield msg;
-          continue;
+          builtInToolPending = (yield* this._runTool(pendingTool, toolHandler)) ?? builtInToolPending;
+          pendingTool = null;
+          inputChunks = [];
         }
 
         // Other events (content_block_start, etc.) — skip
@@ -431,6 +385,35 @@ export class ClaudeProcessManager {
     }
   }
 
+  /**
+   * Yield a tool request and run it through the handler. Custom tool results are
+   * written back and yielded; returns the pending marker when the CLI runs it itself.
+   */
+  private async *_runTool(
+    tool: ToolUseRequest,
+    toolHandler: ToolHandler | null | undefined,
+  ): AsyncGenerator<ParsedMessage, BuiltInToolPending | null> {
+    yield tool;
+    if (!toolHandler) return null;
+    const t0 = Date.now();
+    const resultText = await toolHandler(tool);
+    if (resultText === null) {
+      // Built-in tool — CLI handles it; track timing
+      return { toolUseId: tool.toolUseId, name: tool.name, t0 };
+    }
+    // Custom tool handled by Remi
+    const elapsed = Date.now() - t0;
+    await this._writeLine(formatToolResult(tool.toolUseId, resultText));
+    yield {
+      kind: "tool_result",
+      toolUseId: tool.toolUseId,
+      name: tool.name,
+      result: resultText.slice(0, 1500),
+      durationMs: elapsed,
+    } as ToolResultMessage;
+    return null;
+  }
+
   async stop(): Promise<void> {
     if (!this._process) return;
 
@@ -481,26 +464,26 @@ export class ClaudeProcessManager {
       return null;
     }
 
+    // One timer per line, armed lazily: buffered lines never touch a timer, and
+    // chunked reads re-arm the same timer instead of leaking one per read, so the
+    // timeout still measures silence on stdout rather than the length of a line.
+    let timer: ReturnType<typeof setTimeout> | null = null;
+    let expire: (value: null) => void = () => {};
+    let deadline: Promise<null> | null = null;
+
     try {
       while (true) {
-        // Check if we already have a full line in buffer
-        const newlineIdx = this._lineBuffer.indexOf("\n");
-        if (newlineIdx !== -1) {
-          const line = this._lineBuffer.slice(0, newlineIdx).trim();
-          this._lineBuffer = this._lineBuffer.slice(newlineIdx + 1);
-          if (line) return line;
-          continue;
-        }
+        const buffered = this._takeBufferedLine();
+        if (buffered !== null) return buffered;
 
         // Read more data with timeout to prevent permanent hangs
-        const readResult = await Promise.race([
-          this._reader.read(),
-          new Promise<{ value: undefined; done: true; timedOut: true }>((resolve) =>
-            setTimeout(() => resolve({ value: undefined, done: true, timedOut: true }), timeoutMs),
-          ),
-        ]);
-
-        if ("timedOut" in readResult) {
+        deadline ??= new Promise<null>((resolve) => {
+          expire = resolve;
+          timer = setTimeout(() => expire(null), timeoutMs);
+        });
+        const readResult = await Promise.race([this._reader.read(), deadline]);
+
+        if (readResult === null) {
           log.error(`readline timed out after ${timeoutMs}ms — process likely hung`);
           return null;
         }
@@ -523,21 +506,61 @@ export class ClaudeProcessManager {
           log.error(`stdout stream ended ${ClaudeProcessManager.MAX_READER_REBUILDS} times — giving up`);
           return null;
         }
-        this._lineBuffer += value;
+        this._frameChunk(this._decoder.decode(value, { stream: true }));
+        if (timer) {
+          clearTimeout(timer);
+          timer = setTimeout(() => expire(null), timeoutMs);
+        }
       }
     } catch {
       return null;
+    } finally {
+      if (timer) clearTimeout(timer);
+    }
+  }
+
+  /** Next non-blank line already framed from an earlier chunk, or null once the queue is drained. */
+  private _takeBufferedLine(): string | null {
+    while (this._pendingHead < this._pendingLines.length) {
+      const line = this._pendingLines[this._pendingHead++].trim();
+      if (line) return line;
+    }
+    return null;
+  }
+
+  /**
+   * Split a decoded chunk into complete lines once, rather than re-scanning and
+   * re-slicing the remaining buffer for every line it holds.
+   */
+  private _frameChunk(text: string): void {
+    if (!text.includes("\n")) {
+      this._lineBuffer += text;
+      return;
     }
+    const lines = (this._lineBuffer + text).split("\n");
+    this._lineBuffer = lines.pop()!;
+    this._pendingLines = lines;
+    this._pendingHead = 0;
+  }
+
+  /**
+   * Read stdout bytes directly and decode them in _readline(), instead of piping
+   * through a TextDecoderStream — one stream hop and one promise per chunk fewer.
+   */
+  private _attachReader(stdout: ReadableStream<Uint8Array>): void {
+    this._reader = stdout.getReader();
+    this._decoder = new TextDecoder();
+    this._lineBuffer = "";
+    this._pendingLines = [];
+    this._pendingHead = 0;
   }
 
   /** Rebuild the stdout reader after a transient stream break. */
   private _rebuildReader(): void {
     if (!this._process) return;
     try {
-      const decoder = new TextDecoderStream();
-      this._process.stdout.pipeTo(decoder.writable).catch(() => {});
-      this._reader = decoder.readable.getReader();
-      this._lineBuffer = "";
+      this._reader?.releaseLock();
+      this._attachReader(this._process.stdout);
     } catch (e) {
       log.error("Failed to rebuild reader:", e);
     }
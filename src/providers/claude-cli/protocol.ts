@@ -8,10 +8,10 @@
 
 // ── Parsed message types (CLI stdout -> Remi) ─────────────────
 
+/** Only the init fields Remi reads; the (large) tool list is not carried along. */
 export interface SystemMessage {
   kind: "system";
   sessionId: string;
-  tools: Array<Record<string, unknown>>;
   model: string;
   mcpServers: Array<Record<string, unknown>>;
 }
@@ -129,6 +129,9 @@ export function resetMessageIds(): void {
   _messageIds = [];
 }
 
+/** Leading bytes of a streaming delta frame — by far the most common stdout line. */
+const CONTENT_BLOCK_DELTA_PREFIX = '{"type":"content_block_delta"';
+
 export function parseLine(line: string): ParsedMessage {
   let data: Record<string, unknown>;
   try {
@@ -140,184 +143,218 @@ export function parseLine(line: string): ParsedMessage {
       error: e instanceof Error ? e.message : String(e),
     };
   }
-  const msgType = (data.type as string) ?? "";
 
-  // System init
-  if (msgType === "system" && data.subtype === "init") {
-    return {
-      kind: "system",
-      sessionId: (data.session_id as string) ?? "",
-      tools: (data.tools as Array<Record<string, unknown>>) ?? [],
-      model: (data.model as string) ?? "",
-      mcpServers: (data.mcp_servers as Array<Record<string, unknown>>) ?? [],
-    };
+  // Fast path: delta frames go straight to their decoder, skipping the table lookup
+  if (line.startsWith(CONTENT_BLOCK_DELTA_PREFIX)) {
+    return parseContentBlockDelta(data);
   }
 
-  // Streaming text delta (only text_delta, not input_json_delta)
-  if (msgType === "content_block_delta") {
-    const delta = (data.delta as Record<string, unknown>) ?? {};
-    if (delta.type === "text_delta") {
-      return {
-        kind: "content_delta",
-        text: (delta.text as string) ?? "",
-        index: (data.index as number) ?? 0,
-      };
-    }
-    if (delta.type === "thinking_delta") {
-      return {
-        kind: "thinking_delta",
-        thinking: (delta.thinking as string) ?? "",
-        index: (data.index as number) ?? 0,
-      };
-    }
-    // input_json_delta and others: return raw dict for accumulation
-    return data;
-  }
+  // One hash lookup on "type" instead of walking an if-chain; unknown types pass through raw
+  const parse = LINE_PARSERS.get(data.type as string);
+  return parse ? parse(data) : data;
+}
+
+/**
+ * Canonical input_json_delta frame with partial_json as the last key. The capture is the
+ * still-escaped JSON string body — valid on its own, so fragments can be concatenated.
+ */
+const INPUT_JSON_DELTA_RE =
+  /^\{"type":"content_block_delta","index":\d+,"delta":\{"type":"input_json_delta","partial_json":"((?:[^"\\]|\\.)*)"\}\}$/;
+
+/**
+ * Escaped partial_json of a tool-input delta line, without parsing the frame, or null
+ * when the line isn't in the canonical layout (callers then fall back to parseLine).
+ * Decode the joined fragments with decodeInputJson().
+ */
+export function matchInputJsonDelta(line: string): string | null {
+  if (!line.startsWith('{"type":"content_block_delta"')) return null;
+  const match = INPUT_JSON_DELTA_RE.exec(line);
+  return match ? match[1] : null;
+}
 
-  // Tool use start (streaming content_block_start)
-  if (msgType === "content_block_start") {
-    const block = (data.content_block as Record<string, unknown>) ?? {};
-    if (block.type === "tool_use") {
-      return {
-        kind: "tool_use",
-        toolUseId: (block.id as string) ?? "",
-        name: (block.name as string) ?? "",
-        input: (block.input as Record<string, unknown>) ?? {},
-      };
+/** Turn a decoded partial_json back into its escaped form, for mixing with matched fragments. */
+export function escapeInputJson(partial: string): string {
+  return JSON.stringify(partial).slice(1, -1);
+}
+
+/** Decode concatenated escaped partial_json fragments into the tool-input JSON text. */
+export function decodeInputJson(escaped: string): string {
+  return JSON.parse(`"${escaped}"`) as string;
+}
+
+/** System init; other system subtypes pass through raw. */
+function parseSystem(data: Record<string, unknown>): ParsedMessage {
+  if (data.subtype !== "init") return data;
+  return {
+    kind: "system",
+    sessionId: (data.session_id as string) ?? "",
+    model: (data.model as string) ?? "",
+    mcpServers: (data.mcp_servers as Array<Record<string, unknown>>) ?? [],
+  };
+}
+
+/** Tool use start (streaming content_block_start); text/thinking block starts stay raw. */
+function parseContentBlockStart(data: Record<string, unknown>): ParsedMessage {
+  const block = (data.content_block as Record<string, unknown>) ?? {};
+  if (block.type === "tool_use") return toolUse(block);
+  return data;
+}
+
+/** Assistant message with complete content blocks (non-streaming path). */
+function parseAssistant(data: Record<string, unknown>): ParsedMessage {
+  // Capture requestId for CLI JSONL correlation
+  if (typeof data.requestId === "string") _lastRequestId = data.requestId;
+  // Capture message.id (msg_xxx) — the key for CLI JSONL round correlation
+  const message = (data.message as Record<string, unknown>) ?? {};
+  const msgId = message.id as string | undefined;
+  if (msgId) _messageIds.push(msgId);
+  const content = (message.content as Array<Record<string, unknown>>) ?? [];
+
+  // Parse all blocks into typed messages
+  const parsed: ParsedMessage[] = [];
+  for (const block of content) {
+    if (block.type === "thinking") {
+      parsed.push(thinkingDelta((block.thinking as string) ?? "", 0));
+    } else if (block.type === "tool_use") {
+      parsed.push(toolUse(block));
+    } else if (block.type === "text" && (block.text as string)) {
+      parsed.push(contentDelta(block.text as string, 0));
     }
-    // thinking block start — return raw dict (like text block)
-    return data;
   }
 
-  // Assistant message with complete content blocks (non-streaming path)
-  if (msgType === "assistant") {
-    // Capture requestId for CLI JSONL correlation
-    if (typeof data.requestId === "string") _lastRequestId = data.requestId;
-    // Capture message.id (msg_xxx) — the key for CLI JSONL round correlation
-    const message = (data.message as Record<string, unknown>) ?? {};
-    const msgId = message.id as string | undefined;
-    if (msgId) _messageIds.push(msgId);
-    const content = (message.content as Array<Record<string, unknown>>) ?? [];
-
-    // Parse all blocks into typed messages
-    const parsed: ParsedMessage[] = [];
-    for (const block of content) {
-      if (block.type === "thinking") {
-        parsed.push({
-          kind: "thinking_delta",
-          thinking: (block.thinking as string) ?? "",
-          index: 0,
-        });
-      } else if (block.type === "tool_use") {
-        parsed.push({
-          kind: "tool_use",
-          toolUseId: (block.id as string) ?? "",
-          name: (block.name as string) ?? "",
-          input: (block.input as Record<string, unknown>) ?? {},
-        });
-      } else if (block.type === "text" && (block.text as string)) {
-        parsed.push({
-          kind: "content_delta",
-          text: (block.text as string),
-          index: 0,
-        });
-      }
-    }
+  if (parsed.length === 0) return data;
+  if (parsed.length === 1) return parsed[0];
+  return { kind: "assistant_blocks", blocks: parsed };
+}
 
-    if (parsed.length === 0) return data;
-    if (parsed.length === 1) return parsed[0];
-    return { kind: "assistant_blocks", blocks: parsed };
+/** Rate limit event — Claude CLI nests fields in rate_limit_info; also handles flat layouts. */
+function parseRateLimit(data: Record<string, unknown>): ParsedMessage {
+  const info = (data.rate_limit_info as Record<string, unknown>) ?? {};
+
+  // retry_after_ms: check top-level, then info, then retry_after (seconds) at both levels
+  const retryMs =
+    (typeof data.retry_after_ms === "number" ? data.retry_after_ms : null)
+    ?? (typeof info.retry_after_ms === "number" ? info.retry_after_ms : null)
+    ?? (typeof info.retryAfterMs === "number" ? info.retryAfterMs : null)
+    ?? ((typeof data.retry_after === "number" ? data.retry_after
+        : typeof info.retry_after === "number" ? info.retry_after
+        : 0) * 1000);
+
+  // rateLimitType: try info first (camel), then top-level (camel + snake)
+  const rateLimitType =
+    (info.rateLimitType as string) ?? (info.rate_limit_type as string)
+    ?? (data.rateLimitType as string) ?? (data.rate_limit_type as string)
+    ?? undefined;
+
+  // resetsAt: may be Unix seconds (number) or ISO string
+  let resetsAt: string | undefined;
+  const rawResets = info.resetsAt ?? info.resets_at ?? data.resetsAt ?? data.resets_at;
+  if (typeof rawResets === "number" && rawResets > 0) {
+    resetsAt = new Date(rawResets * 1000).toISOString();
+  } else if (typeof rawResets === "string") {
+    resetsAt = rawResets;
   }
 
-  // Rate limit event
-  // Claude CLI nests fields in rate_limit_info; also handle flat layouts
-  if (msgType === "rate_limit_event" || msgType === "rate_limit") {
-    const info = (data.rate_limit_info as Record<string, unknown>) ?? {};
-
-    // retry_after_ms: check top-level, then info, then retry_after (seconds) at both levels
-    const retryMs =
-      (typeof data.retry_after_ms === "number" ? data.retry_after_ms : null)
-      ?? (typeof info.retry_after_ms === "number" ? info.retry_after_ms : null)
-      ?? (typeof info.retryAfterMs === "number" ? info.retryAfterMs : null)
-      ?? ((typeof data.retry_after === "number" ? data.retry_after
-          : typeof info.retry_after === "number" ? info.retry_after
-          : 0) * 1000);
-
-    // rateLimitType: try info first (camel), then top-level (camel + snake)
-    const rateLimitType =
-      (info.rateLimitType as string) ?? (info.rate_limit_type as string)
-      ?? (data.rateLimitType as string) ?? (data.rate_limit_type as string)
-      ?? undefined;
-
-    // resetsAt: may be Unix seconds (number) or ISO string
-    let resetsAt: string | undefined;
-    const rawResets = info.resetsAt ?? info.resets_at ?? data.resetsAt ?? data.resets_at;
-    if (typeof rawResets === "number" && rawResets > 0) {
-      resetsAt = new Date(rawResets * 1000).toISOString();
-    } else if (typeof rawResets === "string") {
-      resetsAt = rawResets;
-    }
+  // status: "allowed" | "rate_limited"
+  const status = (info.status as string) ?? (data.status as string) ?? undefined;
 
-    // status: "allowed" | "rate_limited"
-    const status = (info.status as string) ?? (data.status as string) ?? undefined;
+  return {
+    kind: "rate_limit",
+    retryAfterMs: retryMs,
+    rateLimitType,
+    resetsAt,
+    status,
+  };
+}
 
-    return {
-      kind: "rate_limit",
-      retryAfterMs: retryMs,
-      rateLimitType,
-      resetsAt,
-      status,
-    };
-  }
+function parseErrorEvent(data: Record<string, unknown>): ParsedMessage {
+  return {
+    kind: "error",
+    error: (data.error as string) ?? JSON.stringify(data),
+    code: (data.code as string) ?? "unknown",
+  };
+}
 
-  // Error event
-  if (msgType === "error") {
-    return {
-      kind: "error",
-      error: (data.error as string) ?? JSON.stringify(data),
-      code: (data.code as string) ?? "unknown",
-    };
+/** Result (end of turn). */
+function parseResult(data: Record<string, unknown>): ParsedMessage {
+  // Capture requestId if present on result, otherwise use last seen from assistant
+  if (typeof data.request_id === "string") _lastRequestId = data.request_id;
+  const usage = (data.usage as Record<string, unknown>) ?? {};
+  // Extract contextWindow from modelUsage (first model entry)
+  let contextWindow: number | null = null;
+  const modelUsage = data.modelUsage as Record<string, Record<string, unknown>> | undefined;
+  if (modelUsage) {
+    const firstModel = Object.values(modelUsage)[0];
+    if (firstModel?.contextWindow != null) contextWindow = firstModel.contextWindow as number;
   }
+  return {
+    kind: "result",
+    result: (data.result as string) ?? "",
+    sessionId: (data.session_id as string) ?? "",
+    requestId: _lastRequestId,
+    costUsd: (data.cost_usd as number) ?? null,
+    model: (data.model as string) ?? "",
+    isError: (data.is_error as boolean) ?? false,
+    durationMs: (data.duration_ms as number) ?? null,
+    inputTokens: (usage.input_tokens as number) ?? null,
+    outputTokens: (usage.output_tokens as number) ?? null,
+    cacheCreateInputTokens: (usage.cache_creation_input_tokens as number) ?? null,
+    cacheReadInputTokens: (usage.cache_read_input_tokens as number) ?? null,
+    contextWindow,
+    permissionDenials: Array.isArray(data.permission_denials)
+      ? (data.permission_denials as Array<Record<string, unknown>>).map((d) => ({
+          toolName: (d.tool_name as string) ?? "",
+          toolUseId: (d.tool_use_id as string) ?? "",
+          toolInput: (d.tool_input as Record<string, unknown>) ?? {},
+        }))
+      : [],
+  };
+}
 
-  // Result (end of turn)
-  if (msgType === "result") {
-    // Capture requestId if present on result, otherwise use last seen from assistant
-    if (typeof data.request_id === "string") _lastRequestId = data.request_id;
-    const usage = (data.usage as Record<string, unknown>) ?? {};
-    // Extract contextWindow from modelUsage (first model entry)
-    let contextWindow: number | null = null;
-    const modelUsage = data.modelUsage as Record<string, Record<string, unknown>> | undefined;
-    if (modelUsage) {
-      const firstModel = Object.values(modelUsage)[0];
-      if (firstModel?.contextWindow != null) contextWindow = firstModel.contextWindow as number;
-    }
-    return {
-      kind: "result",
-      result: (data.result as string) ?? "",
-      sessionId: (data.session_id as string) ?? "",
-      requestId: _lastRequestId,
-      costUsd: (data.cost_usd as number) ?? null,
-      model: (data.model as string) ?? "",
-      isError: (data.is_error as boolean) ?? false,
-      durationMs: (data.duration_ms as number) ?? null,
-      inputTokens: (usage.input_tokens as number) ?? null,
-      outputTokens: (usage.output_tokens as number) ?? null,
-      cacheCreateInputTokens: (usage.cache_creation_input_tokens as number) ?? null,
-      cacheReadInputTokens: (usage.cache_read_input_tokens as number) ?? null,
-      contextWindow,
-      permissionDenials: Array.isArray(data.permission_denials)
-        ? (data.permission_denials as Array<Record<string, unknown>>).map((d) => ({
-            toolName: (d.tool_name as string) ?? "",
-            toolUseId: (d.tool_use_id as string) ?? "",
-            toolInput: (d.tool_input as Record<string, unknown>) ?? {},
-          }))
-        : [],
-    };
+/** Streaming text/thinking delta; input_json_delta and others stay raw for accumulation. */
+function parseContentBlockDelta(data: Record<string, unknown>): ParsedMessage {
+  const delta = (data.delta as Record<string, unknown>) ?? {};
+  if (delta.type === "text_delta") {
+    return contentDelta((delta.text as string) ?? "", (data.index as number) ?? 0);
+  }
+  if (delta.type === "thinking_delta") {
+    return thinkingDelta((delta.thinking as string) ?? "", (data.index as number) ?? 0);
   }
-
   return data;
 }
 
+// Shared constructors for the per-line message types: every call site builds the
+// same property set in the same order, so each kind keeps one object shape.
+
+function contentDelta(text: string, index: number): ContentDelta {
+  return { kind: "content_delta", text, index };
+}
+
+function thinkingDelta(thinking: string, index: number): ThinkingDelta {
+  return { kind: "thinking_delta", thinking, index };
+}
+
+function toolUse(block: Record<string, unknown>): ToolUseRequest {
+  return {
+    kind: "tool_use",
+    toolUseId: (block.id as string) ?? "",
+    name: (block.name as string) ?? "",
+    input: (block.input as Record<string, unknown>) ?? {},
+  };
+}
+
+/** stdout line "type" -> parser, built once at module load. */
+const LINE_PARSERS = new Map<string, (data: Record<string, unknown>) => ParsedMessage>([
+  ["content_block_delta", parseContentBlockDelta],
+  ["content_block_start", parseContentBlockStart],
+  ["assistant", parseAssistant],
+  ["result", parseResult],
+  ["system", parseSystem],
+  ["rate_limit_event", parseRateLimit],
+  ["rate_limit", parseRateLimit],
+  ["error", parseErrorEvent],
+]);
+
 // ── Formatting (Remi -> CLI stdin) ─────────────────────────────
 
 /** Media attachment for multimodal messages. */
@@ -350,11 +387,8 @@ export function formatUserMessage(text: string, media?: MediaAttachment[]): stri
   ) ?? [];
 
   if (images.length === 0) {
-    // Pure text — fast path, no overhead
-    return JSON.stringify({
-      type: "user",
-      message: { role: "user", content: text },
-    });
+    // Pure text — fast path: constant envelope, only the text itself is escaped
+    return `{"type":"user","message":{"role":"user","content":${JSON.stringify(text)}}}`;
   }
 
   // Multimodal: content is an array of blocks
@@ -388,15 +422,17 @@ export function formatUserMessage(text: string, media?: MediaAttachment[]): stri
   });
 }
 
+/** Anything outside printable ASCII, or a quote/backslash, needs real JSON escaping. */
+const NEEDS_ESCAPE = /[^\x20-\x7e]|["\\]/;
+
 export function formatToolResult(
   toolUseId: string,
   result: string,
   isError: boolean = false,
 ): string {
-  return JSON.stringify({
-    type: "tool_result",
-    tool_use_id: toolUseId,
-    content: result,
-    is_error: isError,
-  });
+  // Fast path: plain-ASCII results ("ok", ids, numbers) can be templated verbatim
+  if (!NEEDS_ESCAPE.test(result) && !NEEDS_ESCAPE.test(toolUseId)) {
+    return `{"type":"tool_result","tool_use_id":"${toolUseId}","content":"${result}","is_error":${isError}}`;
+  }
+  return `{"type":"tool_result","tool_use_id":${JSON.stringify(toolUseId)},"content":${JSON.stringify(result)},"is_error":${isError}}`;
 }
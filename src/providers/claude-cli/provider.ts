@@ -54,14 +54,13 @@ export class ClaudeCLIProvider implements Provider {
 
   private _pool = new Map<string, ClaudeProcessManager>();
   private _lastUsed = new Map<string, number>();
-  private _cleanupTimer: ReturnType<typeof setInterval> | null = null;
+  private _cleanupTimer: ReturnType<typeof setTimeout> | null = null;
   private _tools = new Map<string, ToolDefinition>();
   private _preHooks: PreToolHook[] = [];
   private _postHooks: PostToolHook[] = [];
 
   private static DEFAULT_CHAT_ID = "__default__";
   private static IDLE_TIMEOUT_MS = 10 * 60 * 1000;    // 10 minutes
-  private static CLEANUP_INTERVAL_MS = 60 * 1000;      // check every minute
 
   constructor(options: {
     allowedTools?: string[];
@@ -250,13 +249,22 @@ export class ClaudeCLIProvider implements Provider {
     }
   }
 
-  async healthCheck(): Promise<boolean> {
+  async healthCheck(signal?: AbortSignal): Promise<boolean> {
+    if (signal?.aborted) return false;
     try {
-      const result = Bun.spawnSync(["claude", "--version"], {
-        stdout: "pipe",
-        stderr: "pipe",
+      // Async spawn — spawnSync would block the event loop and serialize concurrent checks
+      const proc = Bun.spawn(["claude", "--version"], {
+        stdout: "ignore",
+        stderr: "ignore",
       });
-      return result.exitCode === 0;
+      // A caller that gives up must not leave a hung CLI behind
+      const kill = () => proc.kill();
+      signal?.addEventListener("abort", kill, { once: true });
+      try {
+        return (await proc.exited) === 0;
+      } finally {
+        signal?.removeEventListener("abort", kill);
+      }
     } catch {
       return false;
     }
@@ -283,7 +291,7 @@ export class ClaudeCLIProvider implements Provider {
 
   async close(): Promise<void> {
     if (this._cleanupTimer) {
-      clearInterval(this._cleanupTimer);
+      clearTimeout(this._cleanupTimer);
       this._cleanupTimer = null;
     }
     const stops = [...this._pool.values()].map((mgr) => mgr.stop());
@@ -335,11 +343,23 @@ export class ClaudeCLIProvider implements Provider {
   }
 
   private _ensureCleanupTimer(): void {
+    // An armed timer is never later than a just-started process's deadline
     if (this._cleanupTimer) return;
-    this._cleanupTimer = setInterval(
-      () => this._cleanupIdleProcesses(),
-      ClaudeCLIProvider.CLEANUP_INTERVAL_MS,
-    );
+    this._scheduleCleanup();
+  }
+
+  /** Sleep until the earliest idle deadline instead of polling the pool every minute. */
+  private _scheduleCleanup(): void {
+    if (this._lastUsed.size === 0) return;
+    let earliest = Infinity;
+    for (const lastUsed of this._lastUsed.values()) {
+      if (lastUsed < earliest) earliest = lastUsed;
+    }
+    const delay = Math.max(earliest + ClaudeCLIProvider.IDLE_TIMEOUT_MS - Date.now(), 0) + 1;
+    this._cleanupTimer = setTimeout(() => {
+      this._cleanupTimer = null;
+      this._cleanupIdleProcesses().finally(() => this._ensureCleanupTimer());
+    }, delay);
     if (typeof this._cleanupTimer.unref === "function") {
       this._cleanupTimer.unref();
     }
@@ -364,11 +384,6 @@ export class ClaudeCLIProvider implements Provider {
       this._pool.delete(key);
       this._lastUsed.delete(key);
     }
-
-    if (this._pool.size === 0 && this._cleanupTimer) {
-      clearInterval(this._cleanupTimer);
-      this._cleanupTimer = null;
-    }
   }
 
   private async _sendStreaming(
@@ -9,18 +9,17 @@ import type { Job } from "bunqueue/client";
 import type { CronJobData } from "../queues.js";
 import type { Remi } from "../../core.js";
 import type { Connector } from "../../connectors/base.js";
+import type { Provider } from "../../providers/base.js";
 import { createLogger } from "../../logger.js";
 import {
   existsSync,
   readFileSync,
   writeFileSync,
   mkdirSync,
-  readdirSync,
   appendFileSync,
-  unlinkSync,
-  renameSync,
 } from "node:fs";
-import { join } from "node:path";
+import { appendFile, mkdir, readFile, readdir, rename, unlink } from "node:fs/promises";
+import { join, sep } from "node:path";
 import { homedir } from "node:os";
 
 const log = createLogger("cron:handler");
@@ -29,17 +28,25 @@ type HandlerFn = (remi: Remi, config?: Record<string, any>) => Promise<void>;
 
 const handlers = new Map<string, HandlerFn>();
 
+/** `ENTITY: name (type) - observation` lines in the compaction response. */
+const ENTITY_RE = /ENTITY:\s*(.+?)\s*\((\w+)\)\s*-\s*(.+)/;
+const WORD_RE = /^\w+$/;
+/** Characters `.` won't match — lines containing them take the regex path. */
+const LINE_BREAK_RE = /[\r\u2028\u2029]/;
+/** Rotation filenames, matched and split in one step — anything else is left alone. */
+const WEEKLY_NAME_RE = /^weekly-(\d{4})-W(\d{1,2})\.md$/;
+const DAILY_NAME_RE = /^(\d{4})-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])\.md$/;
+const DAY_MS = 86400000;
+
 // ── Register all built-in handlers ──────────────────────────────
 
 handlers.set("builtin:heartbeat", async (remi) => {
-  for (const [name, provider] of remi._providers) {
-    try {
-      const healthy = await provider.healthCheck();
-      if (!healthy) log.warn(`Provider ${name} health check failed`);
-    } catch (e) {
-      log.error(`Provider ${name} health check error:`, e);
-    }
-  }
+  // Providers are independent — overlap their checks so one slow CLI doesn't serialize the rest,
+  // and bound each one so a hung provider can't stall the batch past half an interval
+  const timeoutMs = (remi.config.scheduler.heartbeatInterval * 1000) / 2;
+  await Promise.all(
+    [...remi._providers].map(([name, provider]) => checkProviderHealth(name, provider, timeoutMs)),
+  );
   if (remi.authStore) {
     try { await remi.authStore.checkAndRefreshAll(); }
     catch (e) { log.error("Auth token refresh check error:", e); }
@@ -49,7 +56,7 @@ handlers.set("builtin:heartbeat", async (remi) => {
 });
 
 handlers.set("builtin:compaction", async (remi) => {
-  const yesterday = localDateStr(new Date(Date.now() - 86400000));
+  const yesterday = localDateStr(new Date(Date.now() - DAY_MS));
   const daily = remi.memory.readDaily(yesterday);
   if (!daily || daily.trim().length < 50) return;
 
@@ -75,13 +82,19 @@ handlers.set("builtin:compaction", async (remi) => {
     const text = response.text.trim();
 
     if (text.toUpperCase() !== "SKIP") {
+      // Single pass: ENTITY lines feed the entity store, everything else is the summary
+      const entityLines: string[] = [];
+      const summaryLines: string[] = [];
       for (const line of text.split("\n")) {
-        if (line.startsWith("ENTITY:")) {
-          processEntityLine(remi, line);
-        }
+        (line.startsWith("ENTITY:") ? entityLines : summaryLines).push(line);
       }
+      const entityOps: Array<[string, string, string]> = [];
+      for (const line of entityLines) {
+        const parsed = parseEntityLine(line);
+        if (parsed) entityOps.push(parsed);
+      }
+      if (entityOps.length > 0) remi.memory.applyEntityBatch(entityOps);
 
-      const summaryLines = text.split("\n").filter((line) => !line.startsWith("ENTITY:"));
       const summaryText = summaryLines.join("\n").trim();
 
       if (summaryText) {
@@ -89,12 +102,11 @@ handlers.set("builtin:compaction", async (remi) => {
         log.info(`Appended compacted memory from ${yesterday}`);
       }
 
-      updateRollingSummary(remi, yesterday, summaryText);
+      await updateRollingSummary(remi, yesterday, summaryText);
     }
   }
 
-  compressWeeklyLogs(remi);
-  archiveOldLogs(remi);
+  await rotateLogs(remi);
 
   // Bridge sync removed in v3 — replaced by Symlink architecture
 });
@@ -239,84 +251,142 @@ function localDateStr(d: Date): string {
   return `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, "0")}-${String(d.getDate()).padStart(2, "0")}`;
 }
 
-function processEntityLine(remi: Remi, line: string): void {
-  const match = line.match(/ENTITY:\s*(.+?)\s*\((\w+)\)\s*-\s*(.+)/);
-  if (!match) return;
-  const [, name, etype, observation] = match;
+async function checkProviderHealth(name: string, provider: Provider, timeoutMs: number): Promise<void> {
+  // The deadline is handed to the provider so it can kill whatever the check spawned
+  const controller = new AbortController();
+  let timer: ReturnType<typeof setTimeout> | undefined;
+  const timeout = new Promise<"timeout">((resolve) => {
+    timer = setTimeout(() => {
+      controller.abort();
+      resolve("timeout");
+    }, timeoutMs);
+  });
   try {
-    const entityPath = remi.memory._findEntityByName(name);
-    if (entityPath) {
-      remi.memory.appendObservation(name, observation);
-    } else {
-      remi.memory.createEntity(name, etype, observation, "agent-inferred");
-    }
+    const healthy = await Promise.race([provider.healthCheck(controller.signal), timeout]);
+    if (healthy === "timeout") log.warn(`Provider ${name} health check timed out after ${timeoutMs}ms`);
+    else if (!healthy) log.warn(`Provider ${name} health check failed`);
   } catch (e) {
-    log.warn(`Failed to process entity ${name}:`, e);
+    log.error(`Provider ${name} health check error:`, e);
+  } finally {
+    clearTimeout(timer);
   }
 }
 
-function updateRollingSummary(remi: Remi, dateStr: string, summary: string): void {
+/**
+ * Split an ENTITY line into [name, type, observation]. Well-formed lines are cut with
+ * index math; anything unusual falls back to ENTITY_RE, whose result is authoritative.
+ */
+function parseEntityLine(line: string): [string, string, string] | null {
+  const rest = line.slice(7).trimStart();
+  const open = rest.indexOf(" (");
+  const close = open === -1 ? -1 : rest.indexOf(")", open + 2);
+  if (close !== -1 && rest.startsWith(" - ", close + 1) && !LINE_BREAK_RE.test(rest)) {
+    const name = rest.slice(0, open).trimEnd();
+    const etype = rest.slice(open + 2, close);
+    const observation = rest.slice(close + 4).trimStart();
+    // A "(" inside the name means the lazy regex could split earlier — let it decide
+    if (name && !name.includes("(") && WORD_RE.test(etype) && observation) {
+      return [name, etype, observation];
+    }
+  }
+  const match = ENTITY_RE.exec(line);
+  return match ? [match[1], match[2], match[3]] : null;
+}
+
+/** Monday (UTC ms) of ISO-8601 week `week` in `year` — week 1 is the one holding Jan 4. */
+function isoWeekStart(year: number, week: number): number {
+  const jan4 = Date.UTC(year, 0, 4);
+  const jan4Dow = (new Date(jan4).getUTCDay() + 6) % 7;
+  return jan4 + ((week - 1) * 7 - jan4Dow) * DAY_MS;
+}
+
+/** Weekly rollup filename for a UTC day, keyed by its ISO-8601 year and week. */
+function isoWeeklyName(dayMs: number): string {
+  // The Thursday of the same ISO week decides the week-numbering year
+  const thursday = dayMs + (3 - ((new Date(dayMs).getUTCDay() + 6) % 7)) * DAY_MS;
+  const year = new Date(thursday).getUTCFullYear();
+  const week = Math.floor((thursday - Date.UTC(year, 0, 1)) / (7 * DAY_MS)) + 1;
+  return `weekly-${year}-W${week < 10 ? "0" : ""}${week}.md`;
+}
+
+async function updateRollingSummary(remi: Remi, dateStr: string, summary: string): Promise<void> {
   const summaryFile = join(remi.memory.root, ".conversation_summary.md");
   try {
-    let existing = "";
-    if (existsSync(summaryFile)) existing = readFileSync(summaryFile, "utf-8");
-    writeFileSync(summaryFile, existing + `\n## ${dateStr}\n${summary}\n`, "utf-8");
+    // Append only the new entry — the file grows daily, so never read it back
+    await appendFile(summaryFile, `\n## ${dateStr}\n${summary}\n`, "utf-8");
   } catch (e) {
     log.warn("Failed to update rolling summary:", e);
   }
 }
 
-function compressWeeklyLogs(remi: Remi): void {
-  const dailyDir = join(remi.memory.root, "daily");
+/**
+ * Rotate daily logs in a single directory scan: dailies aged 8–30 days are folded
+ * into weekly files, and dailies/weeklies older than 30 days move to archive/.
+ * Uses async fs so a large memory dir doesn't stall the event loop.
+ */
+async function rotateLogs(remi: Remi): Promise<void> {
+  const { dailyDir, archiveDir } = remi.memory;
   if (!existsSync(dailyDir)) return;
-  const now = Date.now();
-
-  for (const file of readdirSync(dailyDir).sort()) {
-    if (!file.endsWith(".md") || file.startsWith("weekly-")) continue;
-    const logDate = Date.parse(file.replace(".md", ""));
-    if (isNaN(logDate)) continue;
-
-    const ageDays = (now - logDate) / 86400000;
-    if (ageDays >= 8 && ageDays <= 30) {
-      const d = new Date(logDate);
-      const dayOfYear = Math.floor((d.getTime() - new Date(d.getFullYear(), 0, 0).getTime()) / 86400000);
-      const weekNum = Math.ceil((dayOfYear + new Date(d.getFullYear(), 0, 1).getDay()) / 7);
-      const weeklyName = `weekly-${d.getFullYear()}-W${String(weekNum).padStart(2, "0")}.md`;
-      const weeklyPath = join(dailyDir, weeklyName);
-      const content = readFileSync(join(dailyDir, file), "utf-8");
-      appendFileSync(weeklyPath, `\n## ${file.replace(".md", "")}\n${content}\n`, "utf-8");
-      unlinkSync(join(dailyDir, file));
+  // Entry names are plain basenames — prefix concatenation, no per-file path.join normalization
+  const dailyPrefix = dailyDir + sep;
+  const archivePrefix = archiveDir + sep;
+  // Ages are whole UTC days: integer day ordinals instead of fractional ms differences
+  const today = Math.floor(Date.now() / DAY_MS);
+
+  // Classify every entry once. Dirents come with their type, so archive/ is skipped without a stat.
+  const groups = new Map<string, string[]>();
+  const toArchive: string[] = [];
+  for (const entry of await readdir(dailyDir, { withFileTypes: true })) {
+    const file = entry.name;
+    if (!entry.isFile()) continue;
+
+    const weekly = WEEKLY_NAME_RE.exec(file);
+    if (weekly) {
+      if (today - isoWeekStart(+weekly[1], +weekly[2]) / DAY_MS > 30) toArchive.push(file);
+      continue;
+    }
+
+    const daily = DAILY_NAME_RE.exec(file);
+    if (!daily) continue;
+    const stem = file.slice(0, -3);
+    const logDate = Date.UTC(+daily[1], +daily[2] - 1, +daily[3]);
+    const age = today - logDate / DAY_MS;
+
+    if (age > 30) {
+      toArchive.push(file);
+    } else if (age >= 8) {
+      const weeklyName = isoWeeklyName(logDate);
+      const members = groups.get(weeklyName);
+      if (members) members.push(stem);
+      else groups.set(weeklyName, [stem]);
     }
   }
-}
 
-function archiveOldLogs(remi: Remi): void {
-  const dailyDir = join(remi.memory.root, "daily");
-  if (!existsSync(dailyDir)) return;
-  const archiveDir = join(dailyDir, "archive");
-  const now = Date.now();
-
-  for (const file of readdirSync(dailyDir).sort()) {
-    if (!file.endsWith(".md")) continue;
-    const fullPath = join(dailyDir, file);
-
-    if (file.startsWith("weekly-")) {
-      try {
-        const parts = file.replace(".md", "").split("-");
-        const year = parseInt(parts[1], 10);
-        const week = parseInt(parts[2].slice(1), 10);
-        const weekDate = new Date(year, 0, 1 + (week - 1) * 7);
-        if ((now - weekDate.getTime()) / 86400000 > 30) {
-          if (!existsSync(archiveDir)) mkdirSync(archiveDir, { recursive: true });
-          renameSync(fullPath, join(archiveDir, file));
-        }
-      } catch { continue; }
-    } else {
-      const logDate = Date.parse(file.replace(".md", ""));
-      if (!isNaN(logDate) && (now - logDate) / 86400000 > 30) {
-        if (!existsSync(archiveDir)) mkdirSync(archiveDir, { recursive: true });
-        renameSync(fullPath, join(archiveDir, file));
-      }
+  // One append per weekly file (sections in date order), then drop the dailies it absorbed.
+  // Only the I/O is guarded: a failing group is skipped and its dailies stay for the next run.
+  for (const [weeklyName, stems] of groups) {
+    stems.sort();
+    try {
+      const sections = await Promise.all(
+        stems.map(async (stem) => `\n## ${stem}\n${await readFile(`${dailyPrefix}${stem}.md`, "utf-8")}\n`),
+      );
+      await appendFile(dailyPrefix + weeklyName, sections.join(""), "utf-8");
+    } catch (e) {
+      log.warn(`Failed to compress dailies into ${weeklyName}:`, e);
+      continue;
     }
+    await Promise.all(
+      stems.map((stem) =>
+        unlink(`${dailyPrefix}${stem}.md`).catch((e) => log.warn(`Failed to remove ${stem}.md:`, e)),
+      ),
+    );
   }
+
+  if (toArchive.length === 0) return;
+  await mkdir(archiveDir, { recursive: true });
+  await Promise.all(
+    toArchive.map((file) =>
+      rename(dailyPrefix + file, archivePrefix + file).catch((e) => log.warn(`Failed to archive ${file}:`, e)),
+    ),
+  );
 }
@@ -32,7 +32,7 @@ function describeMemoryStructure(store: MemoryStore): string {
     }
   }
 
-  const dailyDir = join(store.root, "daily");
+  const dailyDir = store.dailyDir;
   if (existsSync(dailyDir)) {
     const count = readdirSync(dailyDir).filter((f) => f.endsWith(".md")).length;
     lines.push(`  daily/: ${count} files`);
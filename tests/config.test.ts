@@ -89,4 +89,23 @@ name = "claude_sdk"
     const config = loadConfig(tomlPath);
     expect(config.provider.name).toBe("codex_sdk"); // env wins
   });
+
+  it("reloads toml after the file changes", () => {
+    const tomlPath = join(tmpDir, "remi.toml");
+    writeFileSync(tomlPath, `[provider]\ntimeout = 120\n`);
+    expect(loadConfig(tomlPath).provider.timeout).toBe(120);
+
+    writeFileSync(tomlPath, `[provider]\ntimeout = 45\nmodel = "opus"\n`);
+    const config = loadConfig(tomlPath);
+    expect(config.provider.timeout).toBe(45);
+    expect(config.provider.model).toBe("opus");
+  });
+
+  it("keeps a cached load isolated from edits to an earlier one", () => {
+    const tomlPath = join(tmpDir, "remi.toml");
+    writeFileSync(tomlPath, `[provider]\nallowed_tools = ["Read"]\n`);
+    const first = loadConfig(tomlPath);
+    first.provider.allowedTools.push("Bash");
+    expect(loadConfig(tomlPath).provider.allowedTools).toEqual(["Read"]);
+  });
 });
@@ -3,6 +3,9 @@ import {
   parseLine,
   formatUserMessage,
   formatToolResult,
+  matchInputJsonDelta,
+  escapeInputJson,
+  decodeInputJson,
   type SystemMessage,
   type ContentDelta,
   type ThinkingDelta,
@@ -29,7 +32,7 @@ describe("parseLine", () => {
     const sys = msg as SystemMessage;
     expect(sys.sessionId).toBe("sess-abc");
     expect(sys.model).toBe("claude-sonnet-4-5-20250929");
-    expect(sys.tools.length).toBe(1);
+    expect("tools" in sys).toBe(false);
   });
 
   it("parses minimal system init", () => {
@@ -38,7 +41,7 @@ describe("parseLine", () => {
     expect(msg.kind).toBe("system");
     const sys = msg as SystemMessage;
     expect(sys.sessionId).toBe("");
-    expect(sys.tools).toEqual([]);
+    expect(sys.mcpServers).toEqual([]);
   });
 
   it("parses content delta text", () => {
@@ -54,6 +57,15 @@ describe("parseLine", () => {
     expect(delta.index).toBe(0);
   });
 
+  it("parses content delta with the type key not first", () => {
+    const line = JSON.stringify({
+      index: 2,
+      type: "content_block_delta",
+      delta: { type: "text_delta", text: "Hi" },
+    });
+    expect(parseLine(line)).toEqual({ kind: "content_delta", text: "Hi", index: 2 });
+  });
+
   it("returns dict for input_json_delta", () => {
     const line = JSON.stringify({
       type: "content_block_delta",
@@ -65,6 +77,20 @@ describe("parseLine", () => {
     expect((msg as Record<string, unknown>).type).toBe("content_block_delta");
   });
 
+  it("extracts escaped partial_json without parsing the frame", () => {
+    const parts = ['{"path":"a\\b', '\n\u00e9\ud83d', '\ude00"}'];
+    const lines = parts.map((partial_json, index) =>
+      JSON.stringify({ type: "content_block_delta", index, delta: { type: "input_json_delta", partial_json } }),
+    );
+    const fragments = lines.map((l) => matchInputJsonDelta(l));
+    expect(fragments).not.toContain(null);
+    expect(decodeInputJson(fragments.join(""))).toBe(parts.join(""));
+    expect(decodeInputJson(parts.map(escapeInputJson).join(""))).toBe(parts.join(""));
+    // Non-canonical layouts are left to parseLine
+    expect(matchInputJsonDelta('{"type":"content_block_delta","index":0,"delta":{"partial_json":"x","type":"input_json_delta"}}')).toBeNull();
+    expect(matchInputJsonDelta('{"type":"content_block_delta","index":0,"delta":{"type":"input_json_delta","partial_json":"x","y":"z"}}')).toBeNull();
+  });
+
   it("parses tool use from content_block_start", () => {
     const line = JSON.stringify({
       type: "content_block_start",
@@ -370,4 +396,12 @@ describe("formatMessages", () => {
     const data = JSON.parse(result);
     expect(data.message.content).toContain("\n");
   });
+
+  it("formats tool result identically on fast and escaped paths", () => {
+    for (const content of ["ok", "42", 'quote " here', "back\\slash", "tab\there", "中文"]) {
+      expect(formatToolResult("toolu_1", content, true)).toBe(
+        JSON.stringify({ type: "tool_result", tool_use_id: "toolu_1", content, is_error: true }),
+      );
+    }
+  });
 });
@@ -1,5 +1,5 @@
 import { describe, it, expect, beforeEach, afterEach } from "bun:test";
-import { mkdirSync, writeFileSync, readFileSync, existsSync, readdirSync, rmSync } from "node:fs";
+import { mkdirSync, writeFileSync, readFileSync, existsSync, readdirSync, rmSync, utimesSync, chmodSync, statSync } from "node:fs";
 import { join } from "node:path";
 import { tmpdir } from "node:os";
 import { MemoryStore, CONTEXT_WARN_THRESHOLD } from "../src/memory/store.js";
@@ -67,6 +67,26 @@ describe("MemoryIndex", () => {
   });
 });
 
+describe("IndexSnapshot", () => {
+  it("reuses persisted entries until the file changes", () => {
+    store.remember("Alice", "person", "CV expert");
+    const path = store._findEntityByName("Alice")!;
+    const old = new Date(Date.now() - 60_000);
+    utimesSync(path, old, old);
+    new MemoryStore(store.root); // persists the snapshot
+
+    const snapshotPath = join(store.root, ".versions", ".index.json");
+    const snapshot = JSON.parse(readFileSync(snapshotPath, "utf-8"));
+    expect(snapshot.entries.length).toBe(1);
+    snapshot.entries[0][3].summary = "from snapshot";
+    writeFileSync(snapshotPath, JSON.stringify(snapshot), "utf-8");
+    expect(new MemoryStore(store.root)["_index"].get(path)!.summary).toBe("from snapshot");
+
+    utimesSync(path, new Date(), new Date());
+    expect(new MemoryStore(store.root)["_index"].get(path)!.summary).toBe("");
+  });
+});
+
 describe("Frontmatter", () => {
   it("parses normal", () => {
     store.remember("Alice", "person", "Test observation");
@@ -82,6 +102,36 @@ describe("Frontmatter", () => {
     expect(meta).toEqual({});
   });
 
+  it("reparses after the file changes", () => {
+    const file = join(store.root, "cached.md");
+    writeFileSync(file, "---\nname: Before\n---\n", "utf-8");
+    expect(store._parseFrontmatter(file).name).toBe("Before");
+    writeFileSync(file, "---\nname: After it changed\n---\n", "utf-8");
+    expect(store._parseFrontmatter(file).name).toBe("After it changed");
+  });
+
+  it("parses flat and nested frontmatter alike", () => {
+    const flat = join(store.root, "flat.md");
+    writeFileSync(flat, "---\nname: Flat\ntags: [a, b]\nimportance: 0.8\nlast_accessed: 2026-01-02\n---\n", "utf-8");
+    const meta = store._parseFrontmatter(flat);
+    expect(meta.tags).toEqual(["a", "b"]);
+    expect(meta.importance).toBe(0.8);
+    expect(meta.last_accessed).toBeInstanceOf(Date);
+
+    const nested = join(store.root, "nested.md");
+    writeFileSync(nested, "---\nname: Nested\ntags:\n  - x\n  - y\n---\n", "utf-8");
+    expect(store._parseFrontmatter(nested).tags).toEqual(["x", "y"]);
+  });
+
+  it("prunes cached parses of entities removed outside the store", () => {
+    store.remember("Alice", "person", "Test observation");
+    const path = store._findEntityByName("Alice")!;
+    expect(store["_frontmatterCache"].has(path)).toBe(true);
+    rmSync(path);
+    store._buildIndex();
+    expect(store["_frontmatterCache"].has(path)).toBe(false);
+  });
+
   it("parses malformed", () => {
     const badFile = join(store.root, "bad.md");
     writeFileSync(badFile, "no frontmatter here", "utf-8");
@@ -155,12 +205,15 @@ describe("EntityCRUD", () => {
     expect(content).toContain("## 备注");
   });
 
-  it("updates frontmatter timestamp", () => {
+  it("updates frontmatter timestamp with the observation", () => {
     store.remember("Alice", "person", "Initial");
     const path = store._findEntityByName("Alice")!;
-    store["_updateFrontmatterTimestamp"](path);
+    writeFileSync(path, readFileSync(path, "utf-8").replace(/^updated:.*$/m, "updated: 2020-01-01T00:00:00"));
+    store["_appendObservation"](path, "New observation");
     const content = readFileSync(path, "utf-8");
     expect(content).toContain("updated:");
+    expect(content).not.toContain("updated: 2020-01-01T00:00:00");
+    expect(content).toContain("New observation");
   });
 });
 
@@ -225,6 +278,26 @@ describe("Recall", () => {
     expect(result).toContain("Bob");
   });
 
+  it("caseless body match is stable across cased queries", async () => {
+    store.remember("Bob", "person", "负责 PaddleOCR 流水线");
+    expect(await store.recall("流水线")).toContain("Bob");
+    await store.recall("paddleocr");
+    expect(await store.recall("流水线")).toContain("Bob");
+  });
+
+  it("caches only entity text and prunes it on rebuild", async () => {
+    store.remember("Bob", "person", "works on PaddleOCR pipeline");
+    store.appendDaily("discussed PaddleOCR optimization", "2026-02-17");
+    await store.recall("PaddleOCR");
+    const cached = [...store["_lowerTextCache"].keys()];
+    expect(cached).toEqual([...store["_index"].keys()]);
+
+    rmSync(join(store.root, "entities"), { recursive: true, force: true });
+    mkdirSync(join(store.root, "entities"));
+    store._buildIndex();
+    expect(store["_lowerTextCache"].size).toBe(0);
+  });
+
   it("filters by type", async () => {
     store.remember("Alice", "person", "engineer");
     store.remember("Acme", "organization", "tech company");
@@ -367,6 +440,14 @@ describe("ProjectRoot", () => {
     const result = store._projectRoot(join(tmpDir, "no_project"));
     expect(result).toBeNull();
   });
+
+  it("finds a .remi created after a miss", () => {
+    const project = join(tmpDir, "late_project");
+    mkdirSync(project, { recursive: true });
+    expect(store._projectRoot(project)).toBeNull();
+    mkdirSync(join(project, ".remi"), { recursive: true });
+    expect(store._projectRoot(project)).toBe(project);
+  });
 });
 
 describe("BuildManifest", () => {
@@ -444,6 +525,22 @@ describe("MaintenanceMethods", () => {
     expect(content).toContain("New entry");
   });
 
+  it("applies entity batch with one write per entity", () => {
+    store.createEntity("Alice", "person", "first");
+    store.applyEntityBatch([
+      ["Alice", "person", "second"],
+      ["Bob", "person", "b1"],
+      ["Alice", "person", "third"],
+      ["Bob", "person", "b2"],
+    ]);
+    const alice = readFileSync(store._findEntityByName("Alice")!, "utf-8");
+    expect(alice.indexOf("third")).toBeLessThan(alice.indexOf("second"));
+    expect(alice.indexOf("second")).toBeLessThan(alice.indexOf("first"));
+    const bob = readFileSync(store._findEntityByName("Bob")!, "utf-8");
+    expect(bob).toContain("source: agent-inferred");
+    expect(bob.indexOf("b2")).toBeLessThan(bob.indexOf("b1"));
+  });
+
   it("deletes entity", () => {
     store.createEntity("ToDelete", "person", "temporary");
     const path = store._findEntityByName("ToDelete")!;
@@ -465,6 +562,14 @@ describe("V1Compat", () => {
     expect(store.readMemory()).toContain("Custom content");
   });
 
+  it("keeps the memory file's mode across rewrites", () => {
+    const memoryFile = join(store.root, "MEMORY.md");
+    chmodSync(memoryFile, 0o600);
+    store.writeMemory("# Private\n");
+    expect(statSync(memoryFile).mode & 0o777).toBe(0o600);
+    expect(readdirSync(store.root).filter((f) => f.endsWith(".tmp"))).toEqual([]);
+  });
+
   it("appends memory", () => {
     store.appendMemory("- New fact");
     const content = store.readMemory();
@@ -1,5 +1,94 @@
-import { describe, it, expect } from "bun:test";
-import { ClaudeProcessManager } from "../src/providers/claude-cli/process.js";
+import { describe, it, expect, beforeAll, afterAll, beforeEach } from "bun:test";
+import { ClaudeProcessManager, type ToolHandler } from "../src/providers/claude-cli/process.js";
+import type { ContentDelta, ParsedMessage, ToolUseRequest } from "../src/providers/claude-cli/protocol.js";
+import { StubProcess, attachStub, initLine } from "./stub-process.js";
+
+const INIT_LINE = initLine("sess-123");
+
+// Frame templates for the fixed CLI shapes: only the interpolated strings go through JSON.stringify
+const textDelta = (index: number, text: string) =>
+  `{"type":"content_block_delta","index":${index},"delta":{"type":"text_delta","text":${JSON.stringify(text)}}}\n`;
+const inputJsonDelta = (index: number, partial: string) =>
+  `{"type":"content_block_delta","index":${index},"delta":{"type":"input_json_delta","partial_json":${JSON.stringify(partial)}}}\n`;
+const blockStop = (index: number) => `{"type":"content_block_stop","index":${index}}\n`;
+const toolUseStart = (index: number, id: string, name: string) =>
+  `{"type":"content_block_start","index":${index},"content_block":{"type":"tool_use","id":${JSON.stringify(id)},"name":${JSON.stringify(name)},"input":{}}}\n`;
+const resultLine = (result: string) =>
+  `{"type":"result","subtype":"success","result":${JSON.stringify(result)},"session_id":"sess-123"}\n`;
+
+// Static stdout frames, built once for every test that replays them
+const CB_START_TEXT = `{"type":"content_block_start","index":0,"content_block":{"type":"text","text":""}}\n`;
+const CB_DELTA_HELLO = textDelta(0, "Hello");
+const CB_DELTA_WORLD = textDelta(0, " world");
+const CB_STOP_0 = blockStop(0);
+const CB_STOP_1 = blockStop(1);
+const TOOL_USE_START_TOOLU1 = toolUseStart(1, "toolu_1", "read_memory");
+const INPUT_DELTA_KEY = inputJsonDelta(1, '{"key"');
+const INPUT_DELTA_PREFS = inputJsonDelta(1, ': "prefs"}');
+const TOOL_USE_START_BASH = toolUseStart(0, "toolu_2", "Bash");
+const RESULT_EMPTY = resultLine("");
+const RESULT_HELLO_WORLD = resultLine("Hello world");
+
+/** Drain a turn, grouping messages by kind as they arrive — one pass, no intermediate list. */
+async function collectByKind(
+  stream: AsyncIterable<ParsedMessage>,
+): Promise<Partial<Record<ParsedMessage["kind"], ParsedMessage[]>>> {
+  const byKind: Partial<Record<ParsedMessage["kind"], ParsedMessage[]>> = {};
+  for await (const msg of stream) (byKind[msg.kind] ??= []).push(msg);
+  return byKind;
+}
+
+// Expected stdin writes, compared verbatim instead of parsed back
+const EXPECTED_TOOL_RESULT_TOOLU1 =
+  '{"type":"tool_result","tool_use_id":"toolu_1","content":"memory content","is_error":false}\n';
+const EXPECTED_USER_HELLO = '{"type":"user","message":{"role":"user","content":"Hello there"}}\n';
+
+interface StreamScenario {
+  readonly lines: readonly string[];
+  readonly handler?: ToolHandler;
+  /** content_delta texts, in order. */
+  readonly texts: readonly string[];
+  /** [toolUseId, input] of each tool_use yielded. */
+  readonly tools: ReadonlyArray<readonly [string, Record<string, unknown>]>;
+  readonly toolResults: number;
+  /** stdin writes after the user message. */
+  readonly writes: readonly string[];
+}
+
+/** One streaming turn per row, all run through the same test body. */
+const STREAM_SCENARIOS: ReadonlyArray<readonly [string, StreamScenario]> = [
+  [
+    "text",
+    {
+      lines: [INIT_LINE, CB_START_TEXT, CB_DELTA_HELLO, CB_DELTA_WORLD, CB_STOP_0, RESULT_HELLO_WORLD],
+      texts: ["Hello", " world"],
+      tools: [],
+      toolResults: 0,
+      writes: [],
+    },
+  ],
+  [
+    "a tool call with a handler",
+    {
+      lines: [INIT_LINE, TOOL_USE_START_TOOLU1, INPUT_DELTA_KEY, INPUT_DELTA_PREFS, CB_STOP_1, RESULT_EMPTY],
+      handler: async () => "memory content",
+      texts: [],
+      tools: [["toolu_1", { key: "prefs" }]],
+      toolResults: 1,
+      writes: [EXPECTED_TOOL_RESULT_TOOLU1],
+    },
+  ],
+  [
+    "a tool call without a handler",
+    {
+      lines: [INIT_LINE, TOOL_USE_START_BASH, CB_STOP_0, RESULT_EMPTY],
+      texts: [],
+      tools: [["toolu_2", {}]],
+      toolResults: 0,
+      writes: [],
+    },
+  ],
+];
 
 describe("BuildCommand", () => {
   it("builds basic command", () => {
@@ -69,6 +158,31 @@ describe("InitialState", () => {
   });
 });
 
+describe("Lifecycle", () => {
+  // Each test gets a manager already running an idle process that only emitted init
+  let mgr: ClaudeProcessManager;
+  let proc: StubProcess;
+
+  beforeEach(() => {
+    proc = new StubProcess([INIT_LINE]);
+    mgr = new ClaudeProcessManager();
+    attachStub(mgr, proc);
+    mgr["_started"] = true;
+  });
+
+  it("start rejects when already running", async () => {
+    expect(mgr.isAlive).toBe(true);
+    await expect(mgr.start()).rejects.toThrow("already running");
+  });
+
+  it("stop closes stdin and resets state", async () => {
+    await mgr.stop();
+    expect(proc.stdin.ended).toBe(true);
+    expect(mgr.isAlive).toBe(false);
+    expect(mgr["_reader"]).toBeNull();
+  });
+});
+
 describe("SendAndStream", () => {
   it("throws when not running", async () => {
     const mgr = new ClaudeProcessManager();
@@ -84,3 +198,78 @@ describe("SendAndStream", () => {
     expect(error!.message).toContain("not running");
   });
 });
+
+describe("StreamingTurns", () => {
+  // One manager for the whole block; each test swaps in a fresh stub process
+  let mgr: ClaudeProcessManager;
+
+  beforeAll(() => {
+    mgr = new ClaudeProcessManager();
+    mgr["_started"] = true;
+  });
+
+  afterAll(() => mgr.stop());
+
+  /** Install a stub process replaying `lines`, as if start() had spawned it. */
+  function replay(lines: readonly string[]): StubProcess {
+    const proc = new StubProcess(lines);
+    attachStub(mgr, proc);
+    return proc;
+  }
+
+  it("user message written to stdin", async () => {
+    const proc = replay([
+      INIT_LINE,
+      RESULT_EMPTY,
+    ]);
+    await Array.fromAsync(mgr.sendAndStream("Hello there"));
+    expect(proc.stdin.writes[0]).toBe(EXPECTED_USER_HELLO);
+  });
+
+  it.each(STREAM_SCENARIOS)("streams %s", async (_name, scenario) => {
+    const proc = replay(scenario.lines);
+    const byKind = await collectByKind(mgr.sendAndStream("Hi", scenario.handler));
+    expect((byKind.content_delta ?? []).map((m) => (m as ContentDelta).text)).toEqual(scenario.texts);
+    expect((byKind.tool_use ?? []).map((m) => [(m as ToolUseRequest).toolUseId, (m as ToolUseRequest).input])).toEqual(
+      scenario.tools,
+    );
+    expect(byKind.tool_result?.length ?? 0).toBe(scenario.toolResults);
+    expect(byKind.result).toHaveLength(1);
+    expect(proc.stdin.writes.slice(1)).toEqual(scenario.writes);
+    expect(mgr.sessionId).toBe("sess-123");
+  });
+});
+
+describe("Readline", () => {
+  it("frames lines across chunk boundaries", async () => {
+    const mgr = new ClaudeProcessManager();
+    const bytes = new TextEncoder().encode('{"a":1}\n\n{"b":"中"}\n{"c"');
+    const chunks = [bytes.slice(0, 5), bytes.slice(5, 13), bytes.slice(13, 16), bytes.slice(16), new TextEncoder().encode(":3}\n")];
+    mgr["_attachReader"](new ReadableStream({
+      start(controller) {
+        for (const chunk of chunks) controller.enqueue(chunk);
+        controller.close();
+      },
+    }));
+    const lines: string[] = [];
+    for (let line = await mgr["_readline"](); line !== null; line = await mgr["_readline"]()) {
+      lines.push(line);
+    }
+    expect(lines).toEqual(['{"a":1}', '{"b":"中"}', '{"c":3}']);
+  });
+
+  it("restarts the timeout while a line is still arriving", async () => {
+    const mgr = new ClaudeProcessManager();
+    const parts = ['{"big":"', "a", "b", "c", "d", '"}\n'];
+    mgr["_attachReader"](new ReadableStream({
+      async pull(controller) {
+        await new Promise((r) => setTimeout(r, 25));
+        const part = parts.shift();
+        if (part === undefined) controller.close();
+        else controller.enqueue(new TextEncoder().encode(part));
+      },
+    }));
+    // Six chunks 25ms apart outlast an 80ms timeout, but no single gap does
+    expect(await mgr["_readline"](80)).toBe('{"big":"abcd"}');
+  });
+});
@@ -1,31 +1,98 @@
-import { describe, it, expect } from "bun:test";
+import { describe, it, expect, beforeEach, afterEach } from "bun:test";
 import { ClaudeCLIProvider } from "../src/providers/claude-cli/provider.js";
-import type { ToolUseRequest } from "../src/providers/claude-cli/protocol.js";
 import type { ToolDefinition } from "../src/providers/base.js";
+import { ClaudeProcessManager } from "../src/providers/claude-cli/process.js";
+import { StubProcess, attachStub, initLine, makeLine } from "./stub-process.js";
+
+const INIT_LINE = initLine("sess-1");
+
+/** read_memory tool call followed by a text answer, built once. */
+const TOOL_CALL_TURN: readonly string[] = [
+  INIT_LINE,
+  makeLine({
+    type: "content_block_start",
+    index: 0,
+    content_block: { type: "tool_use", id: "toolu_1", name: "read_memory", input: {} },
+  }),
+  makeLine({ type: "content_block_delta", index: 0, delta: { type: "input_json_delta", partial_json: "{}" } }),
+  makeLine({ type: "content_block_stop", index: 0 }),
+  makeLine({ type: "content_block_delta", index: 1, delta: { type: "text_delta", text: "You prefer Python." } }),
+  makeLine({ type: "result", subtype: "success", result: "You prefer Python.", session_id: "sess-1" }),
+];
+
+/** Frames of a plain text turn, built once per (text, sessionId) and reused. */
+const LINE_CACHE = new Map<string, readonly string[]>();
+
+function streamingLines(text: string, sessionId = "sess-1"): readonly string[] {
+  const key = `${sessionId}\0${text}`;
+  let lines = LINE_CACHE.get(key);
+  if (!lines) {
+    lines = [
+      INIT_LINE,
+      makeLine({ type: "content_block_delta", index: 0, delta: { type: "text_delta", text } }),
+      makeLine({ type: "result", subtype: "success", result: text, session_id: sessionId }),
+    ];
+    LINE_CACHE.set(key, lines);
+  }
+  return lines;
+}
+
+// Tool handlers, defined once rather than as a fresh closure per test
+function echoHandler(input: unknown): string {
+  return `Got: ${input}`;
+}
+
+function resultHandler(): string {
+  return "result";
+}
+
+function readMemoryHandler(): string {
+  return "User prefers Python";
+}
+
+function boomHandler(): never {
+  throw new Error("boom");
+}
+
+// One provider for the whole file; afterEach puts back everything a test can register
+const provider = new ClaudeCLIProvider();
+
+afterEach(() => {
+  provider["_tools"].clear();
+  provider["_preHooks"].length = 0;
+  provider["_postHooks"].length = 0;
+  provider["_pool"].clear();
+  provider["_lastUsed"].clear();
+});
+
+/** Pool a manager running a stub that replays `lines` under `chatId`, so send/sendStream reuse it. */
+function pooledStub(lines: readonly string[], chatId = ClaudeCLIProvider["DEFAULT_CHAT_ID"]): StubProcess {
+  const proc = new StubProcess(lines);
+  const mgr = new ClaudeProcessManager();
+  attachStub(mgr, proc);
+  provider["_pool"].set(chatId, mgr);
+  return proc;
+}
 
 describe("ClaudeCLIProvider", () => {
   it("has correct name", () => {
-    const provider = new ClaudeCLIProvider();
     expect(provider.name).toBe("claude_cli");
   });
 });
 
 describe("ToolRegistration", () => {
   it("registers tool", () => {
-    const provider = new ClaudeCLIProvider();
     const tool: ToolDefinition = {
       name: "test_tool",
       description: "A test tool",
       parameters: { input: { type: "string" } },
-      handler: (input: unknown) => `Got: ${input}`,
+      handler: echoHandler,
     };
     provider.registerTool(tool);
     expect(provider["_tools"].has("test_tool")).toBe(true);
   });
 
   it("registers tools from dict", () => {
-    const provider = new ClaudeCLIProvider();
-
     function readMemory(): string {
       return "memory content";
     }
@@ -47,19 +114,16 @@ describe("ToolRegistration", () => {
 });
 
 describe("Hooks", () => {
-  function makeProvider(): ClaudeCLIProvider {
-    const p = new ClaudeCLIProvider();
-    p.registerTool({
+  beforeEach(() => {
+    provider.registerTool({
       name: "test_tool",
       description: "test",
       parameters: {},
-      handler: () => "result",
+      handler: resultHandler,
     });
-    return p;
-  }
+  });
 
   it("pre hook allows", async () => {
-    const provider = makeProvider();
     const hookCalled: string[] = [];
     provider.addPreToolHook((name) => {
       hookCalled.push(name);
@@ -76,7 +140,6 @@ describe("Hooks", () => {
   });
 
   it("pre hook blocks", async () => {
-    const provider = makeProvider();
     provider.addPreToolHook(() => false);
 
     const result = await provider._handleToolCall({
@@ -89,7 +152,6 @@ describe("Hooks", () => {
   });
 
   it("post hook called", async () => {
-    const provider = makeProvider();
     const hookResults: Array<[string, string]> = [];
     provider.addPostToolHook((name, _inp, res) => {
       hookResults.push([name, res]);
@@ -105,7 +167,6 @@ describe("Hooks", () => {
   });
 
   it("unknown tool returns null", async () => {
-    const provider = makeProvider();
     const result = await provider._handleToolCall({
       kind: "tool_use",
       toolUseId: "t1",
@@ -116,14 +177,11 @@ describe("Hooks", () => {
   });
 
   it("handles tool handler exception", async () => {
-    const provider = new ClaudeCLIProvider();
     provider.registerTool({
       name: "bad_tool",
       description: "fails",
       parameters: {},
-      handler: () => {
-        throw new Error("boom");
-      },
+      handler: boomHandler,
     });
     const result = await provider._handleToolCall({
       kind: "tool_use",
@@ -134,3 +192,52 @@ describe("Hooks", () => {
     expect(result).toContain("Tool error");
   });
 });
+
+describe("SendStream", () => {
+  it("streams text and a final result", async () => {
+    pooledStub(streamingLines("Hello"));
+    const events = await Array.fromAsync(provider.sendStream("Hi"));
+    expect(events[0]).toEqual({ kind: "content_delta", text: "Hello" });
+    const result = events.at(-1)!;
+    expect(result.kind).toBe("result");
+    if (result.kind === "result") {
+      expect(result.response.text).toBe("Hello");
+      expect(result.response.sessionId).toBe("sess-1");
+    }
+  });
+
+  it("send runs a registered tool", async () => {
+    provider.registerTool({
+      name: "read_memory",
+      description: "Read memory",
+      parameters: {},
+      handler: readMemoryHandler,
+    });
+    const proc = pooledStub(TOOL_CALL_TURN);
+
+    const response = await provider.send("What do I like?");
+    expect(response.text).toBe("You prefer Python.");
+    expect(response.toolCalls).toHaveLength(1);
+    const toolResult = JSON.parse(proc.stdin.writes[1]);
+    expect(toolResult.tool_use_id).toBe("toolu_1");
+    expect(toolResult.content).toBe("User prefers Python");
+  });
+
+  it("send wraps context", async () => {
+    const proc = pooledStub(streamingLines("ok"));
+
+    await provider.send("Hi", { context: "Some memory context" });
+    const raw = proc.stdin.writes[0];
+    expect(raw).toContain("<context>");
+    expect(raw).toContain("Some memory context");
+  });
+
+  it("sendStream wraps context", async () => {
+    const proc = pooledStub(streamingLines("ok"));
+
+    await Array.fromAsync(provider.sendStream("Hi", { context: "Some memory context" }));
+    const raw = proc.stdin.writes[0];
+    expect(raw).toContain("<context>");
+    expect(raw).toContain("Some memory context");
+  });
+});
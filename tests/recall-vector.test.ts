@@ -92,4 +92,26 @@ describe("reindex", () => {
     const count = await store.reindex();
     expect(count).toBe(0);
   });
+
+  it("overlaps upserts with bounded concurrency", async () => {
+    for (let i = 0; i < 20; i++) store.remember(`Entity${i}`, "software", "test");
+    let inFlight = 0;
+    let peak = 0;
+    const upserted: string[] = [];
+    const vectorStore = {
+      async upsert(id: string) {
+        peak = Math.max(peak, ++inFlight);
+        await new Promise((r) => setTimeout(r, 5));
+        inFlight--;
+        upserted.push(id);
+        return true;
+      },
+    };
+    const indexed = new MemoryStore(join(tmpDir, "memory"), vectorStore as never);
+    const count = await indexed.reindex();
+    expect(count).toBe(20);
+    expect(new Set(upserted).size).toBe(20);
+    expect(peak).toBeGreaterThan(1);
+    expect(peak).toBeLessThanOrEqual(8);
+  });
 });
@@ -0,0 +1,72 @@
+/**
+ * Shared test double for the Claude CLI subprocess, used by the process-manager
+ * and provider suites.
+ */
+
+import type { ClaudeProcessManager } from "../src/providers/claude-cli/process.js";
+
+/** Records what the manager writes to the CLI's stdin. */
+export class StubStdin {
+  readonly writes: string[] = [];
+  ended = false;
+
+  write(data: string): void {
+    this.writes.push(data);
+  }
+
+  flush(): void {}
+
+  end(): void {
+    this.ended = true;
+  }
+}
+
+/**
+ * Hand-written stand-in for the CLI subprocess: records stdin writes and replays
+ * canned stdout lines. Only the members ClaudeProcessManager touches exist, and
+ * all of them are plain fields — no per-instance closures.
+ */
+export class StubProcess {
+  killed = false;
+  exitCode: number | null = null;
+  readonly exited = Promise.resolve(0);
+  readonly stdin = new StubStdin();
+  readonly stdout: ReadableStream<Uint8Array>;
+
+  constructor(lines: readonly string[]) {
+    // The whole turn arrives as one chunk: the manager frames every line from a
+    // single read instead of awaiting the stream once per line
+    const chunk = new TextEncoder().encode(lines.join(""));
+    this.stdout = new ReadableStream({
+      start(controller) {
+        controller.enqueue(chunk);
+        controller.close();
+      },
+    });
+  }
+
+  kill() {
+    this.killed = true;
+  }
+}
+
+/** Swap `proc` in as `mgr`'s subprocess, the way start() wires a spawned one. */
+export function attachStub(mgr: ClaudeProcessManager, proc: StubProcess): void {
+  mgr["_process"] = proc as never;
+  mgr["_attachReader"](proc.stdout);
+}
+
+export function makeLine(data: Record<string, unknown>): string {
+  return JSON.stringify(data) + "\n";
+}
+
+/** The CLI's system init frame, which opens every turn. */
+export function initLine(sessionId: string): string {
+  return makeLine({
+    type: "system",
+    subtype: "init",
+    session_id: sessionId,
+    model: "claude-sonnet-4-5-20250929",
+    mcp_servers: [],
+  });
+}